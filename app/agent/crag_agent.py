@@ -9,9 +9,8 @@ from app.agent.nodes import (
     make_generate_node,
     make_grade_node,
     make_retrieve_node,
-    make_rewrite_node,
     make_web_search_node,
-    should_rewrite,
+    should_web_search,
 )
 from app.agent.state import AgentState
 from app.core.providers.base import BaseLLMProvider
@@ -20,6 +19,33 @@ from app.schemas.chat import Source, TokenUsage
 
 logger = logging.getLogger(__name__)
 
+# Node-closure bundles memoized per (tenant.id, provider class). Building the
+# closures per request is pure Python overhead on the event loop; bindings are
+# fixed at first use, so admin config mutations must call
+# invalidate_agent_caches() for the change to reach the agent path.
+_NODE_CACHE: dict[tuple[object, str], tuple[object, ...]] = {}
+
+# Compiled graphs, same keying — StateGraph construction re-runs node/edge
+# validation, which is wasted work after the first compile for a tenant.
+_GRAPH_CACHE: dict[tuple[object, str], CompiledGraph] = {}
+
+
+def invalidate_agent_caches(tenant_id: object | None = None) -> None:
+    """Drop cached node closures and compiled graphs for one tenant (or all).
+
+    The closures capture the Tenant row as first seen, so config changes that
+    gate behavior — restricted_doc_types, domain/system prompt — would
+    otherwise outlive the PATCH that made them until a process restart.
+    `tenant_id` is the tenants.id primary key (cache key[0]); None clears all.
+    """
+    if tenant_id is None:
+        _NODE_CACHE.clear()
+        _GRAPH_CACHE.clear()
+        return
+    for cache in (_NODE_CACHE, _GRAPH_CACHE):
+        for key in [k for k in cache if k[0] == tenant_id]:
+            del cache[key]
+
 
 def create_crag_graph(
     tenant: Tenant,
@@ -27,41 +53,67 @@ def create_crag_graph(
 ) -> CompiledGraph:
     """Compile a CRAG graph with nodes closed over tenant and provider.
 
-    Graph flow:
+    Compiled graphs are cached per (tenant.id, provider class) — lazy
+    compile on first use, so only a tenant's first request pays the
+    StateGraph construction and validation cost.
+
+    Graph flow (grade also rewrites the query in the same LLM call):
         START → retrieve → grade → [relevant]    → generate → END
-                                  → [irrelevant] → rewrite → web_search → generate → END
+                                  → [irrelevant] → web_search → generate → END
     """
+    cache_key = (tenant.id, provider.__class__.__name__)
+    cached = _GRAPH_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
     builder: StateGraph = StateGraph(AgentState)
 
     builder.add_node("retrieve", make_retrieve_node(tenant, provider))
-    builder.add_node("grade", make_grade_node(provider))
-    builder.add_node("rewrite", make_rewrite_node(provider))
+    builder.add_node("grade", make_grade_node(provider, tenant))
     builder.add_node("web_search", make_web_search_node())
     builder.add_node("generate", make_generate_node(tenant, provider))
 
     builder.add_edge(START, "retrieve")
     builder.add_edge("retrieve", "grade")
-    builder.add_conditional_edges("grade", should_rewrite, ["rewrite", "generate"])
-    builder.add_edge("rewrite", "web_search")
+    builder.add_conditional_edges("grade", should_web_search, ["web_search", "generate"])
     builder.add_edge("web_search", "generate")
     builder.add_edge("generate", END)
 
-    return builder.compile()
+    graph = builder.compile()
+    _GRAPH_CACHE[cache_key] = graph
+    return graph
 
 
 async def run_crag(
     query: str,
     tenant: Tenant,
     provider: BaseLLMProvider,
+    answer_queue: asyncio.Queue | None = None,
 ) -> tuple[str, list[Source], TokenUsage | None]:
     """Run the CRAG pipeline and return (answer, sources, usage).
 
-    Builds a new compiled graph per call (graphs are lightweight; tenant/provider
-    bindings live in node closures, not in graph state).
-    """
-    graph = create_crag_graph(tenant, provider)
+    Orchestrates the nodes directly rather than via graph.ainvoke. The
+    fallback path is a single fused grade+rewrite LLM call followed by the
+    web search — the standalone rewrite round trip (and the speculative
+    branch that used to hide it) is gone entirely.
 
-    initial_state: AgentState = {
+    When answer_queue is given, generate_node streams answer deltas into it;
+    a trailing None sentinel is always enqueued (even on error) so SSE
+    consumers never block on a dead stream.
+    """
+    cache_key = (tenant.id, provider.__class__.__name__)
+    nodes = _NODE_CACHE.get(cache_key)
+    if nodes is None:
+        nodes = (
+            make_retrieve_node(tenant, provider),
+            make_grade_node(provider, tenant),
+            make_web_search_node(),
+            make_generate_node(tenant, provider),
+        )
+        _NODE_CACHE[cache_key] = nodes
+    retrieve_node, grade_node, web_search_node, generate_node = nodes
+
+    state: AgentState = {
         "query": query,
         "rewritten_query": "",
         "retrieved_docs": [],
@@ -70,6 +122,7 @@ async def run_crag(
         "answer": "",
         "sources": [],
         "usage": None,
+        "answer_queue": answer_queue,
     }
 
     logger.info(
@@ -77,11 +130,21 @@ async def run_crag(
         extra={"tenant": tenant.tenant_id, "query": query},
     )
 
-    final_state: AgentState = await graph.ainvoke(initial_state)  # type: ignore[assignment]
+    try:
+        state.update(await retrieve_node(state))  # type: ignore[typeddict-item]
+        state.update(await grade_node(state))  # type: ignore[typeddict-item]
+
+        if not state["is_relevant"]:
+            state.update(await web_search_node(state))  # type: ignore[typeddict-item]
+
+        state.update(await generate_node(state))  # type: ignore[typeddict-item]
+    finally:
+        if answer_queue is not None:
+            await answer_queue.put(None)
 
-    answer = final_state.get("answer", "")
-    sources = final_state.get("sources", [])
-    usage: TokenUsage | None = final_state.get("usage")  # type: ignore[assignment]
+    answer = state.get("answer", "")
+    sources = state.get("sources", [])
+    usage: TokenUsage | None = state.get("usage")
 
     logger.info(
         "agent.crag.done",
@@ -1,16 +1,19 @@
 from __future__ import annotations
 
-import json
+import asyncio
+import io
 import logging
 from collections.abc import Callable, Coroutine
 from typing import Any
 
-from pydantic import BaseModel, ValidationError
-from tavily import TavilyClient
+import httpx
+import msgspec
+import orjson
 
 from app.agent.state import AgentState
 from app.config import settings
-from app.core.providers.base import BaseLLMProvider
+from app.core.providers.base import BaseLLMProvider, LLMUsage
+from app.core.semantic_cache import SemanticCache
 from app.db.models import Tenant
 from app.retrieval import retriever
 from app.schemas.chat import Source, TokenUsage
@@ -28,13 +31,79 @@ _MAX_CONTEXT_CHARS = 12_000
 
 
 # ---------------------------------------------------------------------------
-# Internal Pydantic model for structured grading output
+# Internal struct for structured grading output
 # ---------------------------------------------------------------------------
 
 
-class GradeDecision(BaseModel):
+class GradeAndRewrite(msgspec.Struct):
     is_relevant: bool
     reasoning: str = ""
+    rewritten_query: str = ""
+
+
+# Single-pass C-level parse+validate of the grade payload (vs json.loads +
+# a Pydantic model_validate second pass)
+_GRADE_DECODER = msgspec.json.Decoder(GradeAndRewrite)
+
+# Constant grader prompt — built once, not per call
+_GRADE_SYSTEM_PROMPT = (
+    "You are a document relevance grader and search query optimizer. "
+    "Evaluate whether the retrieved document contains enough information "
+    "to answer the user's question. If it does NOT, also rewrite the "
+    "question to be more specific and keyword-rich so a web search "
+    "retrieves better results (else use an empty string). "
+    "Respond ONLY with valid JSON matching: "
+    '{"is_relevant": true|false, "reasoning": "<brief explanation>", '
+    '"rewritten_query": "<rewritten query or empty string>"}'
+)
+
+
+# ---------------------------------------------------------------------------
+# Cached LLM generation
+# ---------------------------------------------------------------------------
+
+# Shared across all agent nodes; entries are namespaced per tenant
+_generation_cache = SemanticCache()
+
+
+async def _cached_generate(
+    provider: BaseLLMProvider,
+    system_prompt: str,
+    user_message: str,
+    *,
+    namespace: str,
+    **kwargs: object,
+) -> tuple[str, LLMUsage | None]:
+    """provider.generate with an exact-hash + semantic cache in front.
+
+    Exact SHA-256 hits skip all API calls; otherwise the user message is
+    embedded (one cheap embedding call vs. an LLM round trip) and looked up
+    by cosine similarity before falling through to the real generation.
+    Cache hits return usage=None since no tokens were spent.
+    """
+    key = SemanticCache.exact_key(namespace, system_prompt, user_message)
+    answer = _generation_cache.get_exact(key)
+    if answer is not None:
+        logger.info("agent.cache.hit", extra={"kind": "exact", "namespace": namespace})
+        return answer, None
+
+    embedding: list[float] | None = None
+    try:
+        embedding = await provider.embed(user_message)
+    except Exception:
+        logger.debug("agent.cache: embed failed — skipping semantic lookup", exc_info=True)
+
+    if embedding is not None:
+        answer = _generation_cache.get_semantic(namespace, embedding)
+        if answer is not None:
+            logger.info(
+                "agent.cache.hit", extra={"kind": "semantic", "namespace": namespace}
+            )
+            return answer, None
+
+    answer, usage = await provider.generate(system_prompt, user_message, **kwargs)
+    _generation_cache.put(namespace, key, embedding, answer)
+    return answer, usage
 
 
 # ---------------------------------------------------------------------------
@@ -57,91 +126,108 @@ def make_retrieve_node(tenant: Tenant, provider: BaseLLMProvider) -> _Node:
     return retrieve_node
 
 
-def make_grade_node(provider: BaseLLMProvider) -> _Node:
-    """Return an async node that grades whether retrieved docs answer the query.
+def make_grade_node(provider: BaseLLMProvider, tenant: Tenant | None = None) -> _Node:
+    """Return an async node that grades retrieved docs and rewrites on failure.
+
+    Each doc is graded in its own (cached) LLM call, all in parallel: latency
+    is one short per-doc prefill instead of one long concatenated prompt, the
+    first relevant verdict cancels the rest, and per-doc results cache well
+    because chunk content rarely changes between queries.
 
-    Fail-open: returns is_relevant=True on any parse or LLM error so the
+    Fail-open: a doc whose grade call errors counts as relevant so the
     pipeline never silently falls back to web search due to a grading bug.
     """
-
-    async def grade_node(state: AgentState) -> dict[str, Any]:
-        query = state["query"]
-        docs: list[RetrievedChunk] = state.get("retrieved_docs", [])
-
-        if not docs:
-            logger.info("agent.grade: no docs retrieved — marking irrelevant")
-            return {"is_relevant": False}
-
-        # Format docs as a compact preview for the grader
-        doc_text = _format_docs_for_grading(docs)
-
-        system_prompt = (
-            "You are a document relevance grader. "
-            "Evaluate whether the retrieved documents contain enough information "
-            "to answer the user's question. "
-            "Respond ONLY with valid JSON matching: "
-            '{"is_relevant": true|false, "reasoning": "<brief explanation>"}'
-        )
+    tenant_ns = tenant.tenant_id if tenant else "global"
+    # The :grade suffix keeps this semantic namespace disjoint from
+    # generate's. Their user messages for the same query+chunk are
+    # near-duplicates, and a shared namespace would let one call kind hit
+    # the other's cached output — grader JSON served as a chat answer, or
+    # prose fed to the grade decoder.
+    namespace = f"{tenant_ns}:grade"
+
+    async def grade_one(query: str, doc: RetrievedChunk) -> GradeAndRewrite:
         user_message = (
             f"USER QUESTION:\n{query}\n\n"
-            f"RETRIEVED DOCUMENTS:\n{doc_text}\n\n"
+            f"RETRIEVED DOCUMENT:\n{_format_docs_for_grading([doc])}\n\n"
             "Is the retrieved content sufficient to answer the question?"
         )
-
         try:
-            raw, _ = await provider.generate(
-                system_prompt,
+            raw, _ = await _cached_generate(
+                provider,
+                _GRADE_SYSTEM_PROMPT,
                 user_message,
+                namespace=namespace,
                 response_format={"type": "json_object"},
+                cache_key=f"grade:{tenant_ns}",
             )
-            decision = GradeDecision.model_validate(json.loads(raw))
-            logger.info(
-                "agent.grade",
-                extra={
-                    "is_relevant": decision.is_relevant,
-                    "reasoning": decision.reasoning,
-                },
-            )
-            return {"is_relevant": decision.is_relevant}
-        except (json.JSONDecodeError, ValidationError, Exception) as exc:
+            return _GRADE_DECODER.decode(raw)
+        except (msgspec.DecodeError, msgspec.ValidationError, Exception) as exc:
             logger.warning("agent.grade: parse error — failing open", exc_info=exc)
-            return {"is_relevant": True}
-
-    return grade_node
+            return GradeAndRewrite(is_relevant=True)
 
+    async def grade_node(state: AgentState) -> dict[str, Any]:
+        query = state["query"]
+        docs: list[RetrievedChunk] = state.get("retrieved_docs", [])
 
-def make_rewrite_node(provider: BaseLLMProvider) -> _Node:
-    """Return an async node that rewrites the query for better retrieval."""
+        if not docs:
+            logger.info("agent.grade: no docs retrieved — marking irrelevant")
+            return {"is_relevant": False}
 
-    async def rewrite_node(state: AgentState) -> dict[str, Any]:
-        original = state["query"]
-        system_prompt = (
-            "You are a search query optimization expert. "
-            "Rewrite the user's question to be more specific and keyword-rich "
-            "so it retrieves better results from a technical document store. "
-            "Output ONLY the rewritten query — no explanation, no quotes."
-        )
-        user_message = f"Original question: {original}"
+        # High-confidence retrieval skips the LLM grade entirely —
+        # similarity_score is cosine distance, so relevance is 1 - distance
+        threshold = settings.grade_skip_threshold
+        if threshold > 0:
+            confidence = max(1.0 - doc.similarity_score for doc in docs)
+            if confidence >= threshold:
+                logger.info(
+                    "agent.grade.skipped",
+                    extra={"confidence": round(confidence, 4), "threshold": threshold},
+                )
+                return {"is_relevant": True}
+
+        tasks = [asyncio.create_task(grade_one(query, doc)) for doc in docs]
+        rewritten = ""
+        try:
+            for future in asyncio.as_completed(tasks):
+                decision = await future
+                if decision.is_relevant:
+                    logger.info(
+                        "agent.grade",
+                        extra={"is_relevant": True, "reasoning": decision.reasoning},
+                    )
+                    return {"is_relevant": True, "rewritten_query": ""}
+                if not rewritten:
+                    rewritten = decision.rewritten_query.strip()
+        finally:
+            # First relevant verdict (or an error) makes the rest moot
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
 
-        rewritten, _ = await provider.generate(system_prompt, user_message)
-        rewritten = rewritten.strip().strip('"').strip("'")
         logger.info(
-            "agent.rewrite",
-            extra={"original": original, "rewritten": rewritten},
+            "agent.grade",
+            extra={"is_relevant": False, "rewritten": rewritten},
         )
-        return {"rewritten_query": rewritten}
+        return {"is_relevant": False, "rewritten_query": rewritten}
+
+    return grade_node
+
 
-    return rewrite_node
+# Shared async HTTP client for Tavily — avoids the sync SDK's thread-pool
+# hop and keeps one connection pool across all fallback searches.
+_tavily_http = httpx.AsyncClient(base_url="https://api.tavily.com", timeout=10.0)
 
 
 def make_web_search_node() -> _Node:
     """Return an async node that performs a Tavily web search fallback.
 
-    Raises ValueError at call time if TAVILY_API_KEY is not configured.
+    Calls Tavily's REST endpoint directly over the shared httpx.AsyncClient
+    rather than offloading the blocking SDK to the default executor, so
+    searches stay on the event loop and aren't capped by thread-pool size.
     """
+    api_key = settings.tavily_api_key
 
     async def web_search_node(state: AgentState) -> dict[str, Any]:
-        api_key = settings.tavily_api_key
         if not api_key:
             logger.warning("agent.web_search.skipped: TAVILY_API_KEY not set")
             return {"web_results": ""}
@@ -149,16 +235,14 @@ def make_web_search_node() -> _Node:
         query = state.get("rewritten_query") or state["query"]
         logger.info("agent.web_search", extra={"query": query})
 
-        # TavilyClient is synchronous — run in thread pool via asyncio
-        import asyncio
-
-        loop = asyncio.get_event_loop()
-        client = TavilyClient(api_key=api_key)
         try:
-            results = await loop.run_in_executor(
-                None,
-                lambda: client.search(query, max_results=3),
+            response = await _tavily_http.post(
+                "/search",
+                json={"api_key": api_key, "query": query, "max_results": 3},
             )
+            response.raise_for_status()
+            # orjson is ~3x faster than the stdlib parser httpx.json() uses
+            results = orjson.loads(response.content)
         except Exception as exc:
             logger.warning("agent.web_search.failed", extra={"error": str(exc)})
             return {"web_results": ""}
@@ -175,6 +259,15 @@ def make_web_search_node() -> _Node:
 
 def make_generate_node(tenant: Tenant, provider: BaseLLMProvider) -> _Node:
     """Return an async node that generates the final answer with source citations."""
+    # Tenant-specific prompt is fixed for the factory's lifetime — build once
+    domain = tenant.config.get("domain", "technical documents") if tenant.config else "technical documents"
+    system_prompt = (
+        f"You are an expert assistant for {tenant.name}, "
+        f"specialising in {domain}. "
+        "Answer the user's question using ONLY the provided context. "
+        "Cite sources inline as [1], [2], etc. and list them at the end under "
+        "'## Sources'. If the context does not contain the answer, say so clearly."
+    )
 
     async def generate_node(state: AgentState) -> dict[str, Any]:
         query = state["query"]
@@ -182,15 +275,6 @@ def make_generate_node(tenant: Tenant, provider: BaseLLMProvider) -> _Node:
         docs: list[RetrievedChunk] = state.get("retrieved_docs", [])
         web_results: str = state.get("web_results", "")
 
-        domain = tenant.config.get("domain", "technical documents") if tenant.config else "technical documents"
-        system_prompt = (
-            f"You are an expert assistant for {tenant.name}, "
-            f"specialising in {domain}. "
-            "Answer the user's question using ONLY the provided context. "
-            "Cite sources inline as [1], [2], etc. and list them at the end under "
-            "'## Sources'. If the context does not contain the answer, say so clearly."
-        )
-
         if is_relevant and docs:
             context, sources = _build_vector_context(docs)
         else:
@@ -199,7 +283,27 @@ def make_generate_node(tenant: Tenant, provider: BaseLLMProvider) -> _Node:
 
         user_message = f"Question: {query}\n\nContext:\n{context}"
 
-        answer, llm_usage = await provider.generate(system_prompt, user_message)
+        queue = state.get("answer_queue")
+        if queue is not None:
+            # Streaming path: forward deltas as they arrive so the API can
+            # flush them to the client; usage isn't reported mid-stream.
+            parts: list[str] = []
+            async for delta in provider.astream(
+                system_prompt, user_message, cache_key=f"generate:{tenant.tenant_id}"
+            ):
+                parts.append(delta)
+                await queue.put(delta)
+            answer, llm_usage = "".join(parts), None
+        else:
+            answer, llm_usage = await _cached_generate(
+                provider,
+                system_prompt,
+                user_message,
+                # :generate suffix keeps this semantic namespace disjoint
+                # from the near-duplicate grade prompts (see make_grade_node)
+                namespace=f"{tenant.tenant_id}:generate",
+                cache_key=f"generate:{tenant.tenant_id}",
+            )
         usage = (
             TokenUsage(
                 input_tokens=llm_usage.input_tokens,
@@ -229,9 +333,9 @@ def make_generate_node(tenant: Tenant, provider: BaseLLMProvider) -> _Node:
 # ---------------------------------------------------------------------------
 
 
-def should_rewrite(state: AgentState) -> str:
-    """Conditional edge: route to 'generate' if docs are relevant, else 'rewrite'."""
-    return "generate" if state.get("is_relevant", False) else "rewrite"
+def should_web_search(state: AgentState) -> str:
+    """Conditional edge: route to 'generate' if docs are relevant, else 'web_search'."""
+    return "generate" if state.get("is_relevant", False) else "web_search"
 
 
 # ---------------------------------------------------------------------------
@@ -240,38 +344,53 @@ def should_rewrite(state: AgentState) -> str:
 
 
 def _format_docs_for_grading(docs: list[RetrievedChunk]) -> str:
-    parts: list[str] = []
+    # Single StringIO buffer instead of per-chunk f-string + join: the
+    # oversampled doc list makes string churn measurable in this hot path.
+    buf = io.StringIO()
+    write = buf.write
     for i, doc in enumerate(docs, 1):
-        heading = f" — {doc.heading}" if doc.heading else ""
-        preview = doc.content[:_CHUNK_PREVIEW_CHARS]
-        if len(doc.content) > _CHUNK_PREVIEW_CHARS:
-            preview += "..."
-        parts.append(
-            f"[{i}] {doc.doc_number or 'N/A'} p.{doc.page_number}{heading}\n{preview}"
-        )
-    return "\n\n".join(parts)
+        if i > 1:
+            write("\n\n")
+        write(f"[{i}] {doc.doc_number or 'N/A'} p.{doc.page_number}")
+        if doc.heading:
+            write(f" — {doc.heading}")
+        write("\n")
+        content = doc.content
+        if len(content) > _CHUNK_PREVIEW_CHARS:
+            write(content[:_CHUNK_PREVIEW_CHARS])
+            write("...")
+        else:
+            write(content)
+    return buf.getvalue()
 
 
 def _build_vector_context(docs: list[RetrievedChunk]) -> tuple[str, list[Source]]:
     """Format retrieved chunks into a context string and extract Source citations."""
-    parts: list[str] = []
+    buf = io.StringIO()
+    write = buf.write
     sources: list[Source] = []
-    total_chars = 0
 
     for i, doc in enumerate(docs, 1):
         heading = f" — {doc.heading}" if doc.heading else ""
         label = f"[{i}] {doc.doc_number or 'N/A'} p.{doc.page_number}{heading}"
         snippet = doc.content
-        block = f"{label}\n{snippet}"
+        separator = "\n\n" if i > 1 else ""
 
-        if total_chars + len(block) > _MAX_CONTEXT_CHARS:
-            remaining = _MAX_CONTEXT_CHARS - total_chars
+        # buf.tell() is the running char count — no separate accumulator
+        remaining = _MAX_CONTEXT_CHARS - buf.tell()
+        if len(separator) + len(label) + 1 + len(snippet) > remaining:
             if remaining > 200:
-                parts.append(f"{label}\n{snippet[:remaining]}...")
+                write(separator)
+                write(label)
+                write("\n")
+                write(snippet[:remaining])
+                write("...")
             break
 
-        parts.append(block)
-        total_chars += len(block)
+        write(separator)
+        write(label)
+        write("\n")
+        write(snippet)
         # similarity_score is cosine distance (0=identical); convert to 0–1 relevance
         relevance = round(max(0.0, 1.0 - doc.similarity_score), 4)
         sources.append(
@@ -284,7 +403,7 @@ def _build_vector_context(docs: list[RetrievedChunk]) -> tuple[str, list[Source]
             )
         )
 
-    return "\n\n".join(parts), sources
+    return buf.getvalue(), sources
 
 
 def _format_tavily_results(results: dict[str, Any]) -> str:
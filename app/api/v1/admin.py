@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import hashlib
 import logging
 import secrets
 from uuid import UUID
@@ -9,6 +8,8 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.agent.crag_agent import invalidate_agent_caches
+from app.core.security import hash_api_key, invalidate_tenant_cache
 from app.core.token_budget import get_all_usage
 from app.db.models import Tenant
 from app.db.schema_utils import create_tenant_schema
@@ -54,7 +55,7 @@ async def create_tenant(
         raise HTTPException(status_code=409, detail=f"Tenant '{body.tenant_id}' already exists")
 
     api_key = secrets.token_hex(32)
-    api_key_hash = hashlib.sha256(api_key.encode()).hexdigest()
+    api_key_hash = hash_api_key(api_key)
     schema_name = f"tenant_{body.tenant_id}"
     s3_prefix = f"tenants/{body.tenant_id}/"
 
@@ -150,6 +151,12 @@ async def patch_tenant(
     await session.commit()
     await session.refresh(tenant)
 
+    # Deactivation/config changes must take effect before the auth cache TTL
+    invalidate_tenant_cache(tenant.api_key_hash)
+    # The agent's node/graph closures capture the Tenant row with no TTL at
+    # all — drop them so restricted_doc_types/domain changes apply now
+    invalidate_agent_caches(tenant.id)
+
     logger.info(
         "admin.patch_tenant",
         extra={"tenant_id": str(tenant_id)},
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
+from collections.abc import AsyncIterator
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.agent.adaptive_rag_agent import run_adaptive_rag
@@ -19,22 +23,62 @@ router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
+def _sse_stream(
+    query: str, tenant: Tenant, provider: BaseLLMProvider
+) -> AsyncIterator[str]:
+    """Run CRAG with a delta queue and yield SSE events as tokens arrive.
+
+    Events: {"delta": "..."} per token batch, then {"sources": [...], "query": ...}
+    once the agent finishes, then the [DONE] marker. Errors surface as an
+    {"error": ...} event — the 200 status is already on the wire by then.
+    """
+    queue: asyncio.Queue[str | None] = asyncio.Queue()
+    task = asyncio.create_task(run_crag(query, tenant, provider, answer_queue=queue))
+
+    async def event_stream() -> AsyncIterator[str]:
+        try:
+            while (delta := await queue.get()) is not None:
+                yield f"data: {json.dumps({'delta': delta})}\n\n"
+            _, sources, _ = await task
+            tail = {"sources": [s.model_dump() for s in sources], "query": query}
+            yield f"data: {json.dumps(tail)}\n\n"
+        except Exception:
+            logger.exception("chat.stream.error tenant=%s", tenant.tenant_id)
+            yield f"data: {json.dumps({'error': 'Agent failed. Check server logs.'})}\n\n"
+        finally:
+            if not task.done():
+                task.cancel()
+            yield "data: [DONE]\n\n"
+
+    return event_stream()
+
+
 @router.post("", response_model=ChatResponse)
 async def chat(
     body: ChatRequest,
     tenant: Tenant = Depends(get_tenant),
     provider: BaseLLMProvider = Depends(get_provider),
     session: AsyncSession = Depends(get_db),
-) -> ChatResponse:
+) -> ChatResponse | StreamingResponse:
     """Query the knowledge base using the selected agent.
 
     agent_type="crag" (default): single retrieve-grade-generate cycle with web fallback.
     agent_type="reflexion": multi-hop iterative draft→retrieve→revise loop.
     agent_type="self_rag": per-doc relevance grading + hallucination detection + answer quality check.
     agent_type="adaptive_rag": intelligent router → Self-RAG / web search / SQL (stub) based on query intent.
+
+    stream=true (crag only): Server-Sent Events — time-to-first-token drops to
+    one prefill latency instead of the full decode. Token usage is not
+    recorded on the streaming path.
     """
     await check_token_budget(session, tenant.tenant_id)
 
+    if body.stream and body.agent_type == "crag":
+        return StreamingResponse(
+            _sse_stream(body.query, tenant, provider),
+            media_type="text/event-stream",
+        )
+
     try:
         if body.agent_type == "reflexion":
             answer, sources, usage = await run_reflexion(body.query, tenant, provider)
@@ -6,11 +6,11 @@ from uuid import UUID
 import boto3
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.config import settings
 from app.db.models import Document, Tenant
-from app.db.session import tenant_session
-from app.dependencies import get_tenant
+from app.dependencies import get_tenant, get_tenant_session_maker
 from app.schemas.document import DocumentResponse
 
 router = APIRouter()
@@ -20,10 +20,10 @@ logger = logging.getLogger(__name__)
 @router.get("", response_model=list[DocumentResponse])
 async def list_documents(
     doc_type: str | None = Query(default=None, description="Filter by document type (e.g. SOP, ENG-DRW)"),
-    tenant: Tenant = Depends(get_tenant),
+    tenant: Tenant = Depends(get_tenant),  # noqa: ARG001 (auth gate)
+    session_maker: async_sessionmaker[AsyncSession] = Depends(get_tenant_session_maker),
 ) -> list[DocumentResponse]:
     """List documents for the authenticated tenant, ordered by created_at DESC."""
-    session_maker = tenant_session(tenant.schema_name)
     async with session_maker() as session:
         stmt = select(Document).order_by(Document.created_at.desc())
         if doc_type is not None:
@@ -48,13 +48,48 @@ async def list_documents(
     ]
 
 
+@router.get("/by-hash/{file_hash}", response_model=DocumentResponse)
+async def get_document_by_hash(
+    file_hash: str,
+    tenant: Tenant = Depends(get_tenant),  # noqa: ARG001 (auth gate)
+    session_maker: async_sessionmaker[AsyncSession] = Depends(get_tenant_session_maker),
+) -> DocumentResponse:
+    """Look up a document by its dedup file hash.
+
+    Clients that hash locally can skip the upload entirely on a hit —
+    the same check the ingest pipeline runs server-side, but before the
+    multi-MB body transits the network.
+    """
+    async with session_maker() as session:
+        result = await session.execute(
+            select(Document).where(Document.file_hash == file_hash).limit(1)
+        )
+        doc = result.scalar_one_or_none()
+
+    if doc is None:
+        raise HTTPException(status_code=404, detail="Document not found")
+
+    return DocumentResponse(
+        id=doc.id,
+        filename=doc.filename,
+        doc_number=doc.doc_number,
+        doc_type=doc.doc_type,
+        revision=doc.revision,
+        title=doc.title,
+        classification=doc.classification,
+        page_count=doc.page_count,
+        status=doc.status,
+        created_at=doc.created_at,
+    )
+
+
 @router.delete("/{document_id}", status_code=204, response_model=None)
 async def delete_document(
     document_id: UUID,
     tenant: Tenant = Depends(get_tenant),
+    session_maker: async_sessionmaker[AsyncSession] = Depends(get_tenant_session_maker),
 ) -> None:
     """Delete a document and all its chunks. Also removes the S3 object (non-dev)."""
-    session_maker = tenant_session(tenant.schema_name)
     async with session_maker() as session:
         doc = await session.get(Document, document_id)
         if doc is None:
@@ -3,11 +3,10 @@ from __future__ import annotations
 from uuid import UUID
 
 from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, UploadFile
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.db.models import IngestJob, Tenant
-from app.db.session import tenant_session
-from app.dependencies import get_db, get_tenant
+from app.dependencies import get_db, get_tenant, get_tenant_session_maker
 from app.ingestion.hash_check import compute_hash, find_existing
 from app.ingestion.pipeline import run_pipeline
 from app.schemas.ingest import IngestResponse, JobStatusResponse
@@ -20,6 +19,7 @@ async def upload_document(
     background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     tenant: Tenant = Depends(get_tenant),
+    TenantSession: async_sessionmaker[AsyncSession] = Depends(get_tenant_session_maker),
     session: AsyncSession = Depends(get_db),  # noqa: ARG001 (kept for DI lifecycle)
 ) -> IngestResponse:
     """Upload a PDF for ingestion. Returns immediately with a job_id to poll."""
@@ -30,8 +30,6 @@ async def upload_document(
     if not pdf_bytes:
         raise HTTPException(status_code=400, detail="Uploaded file is empty")
 
-    TenantSession = tenant_session(tenant.schema_name)
-
     async with TenantSession() as ts:
         # Fast dedup check BEFORE creating a job
         file_hash = compute_hash(pdf_bytes)
@@ -71,11 +69,11 @@ async def upload_document(
 @router.get("/{job_id}", response_model=JobStatusResponse)
 async def get_job_status(
     job_id: UUID,
-    tenant: Tenant = Depends(get_tenant),
+    tenant: Tenant = Depends(get_tenant),  # noqa: ARG001 (auth gate)
+    TenantSession: async_sessionmaker[AsyncSession] = Depends(get_tenant_session_maker),
     session: AsyncSession = Depends(get_db),  # noqa: ARG001
 ) -> JobStatusResponse:
     """Poll the status of an ingest job."""
-    TenantSession = tenant_session(tenant.schema_name)
     async with TenantSession() as ts:
         job = await ts.get(IngestJob, job_id)
 
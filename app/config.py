@@ -9,6 +9,7 @@ class Settings(BaseSettings):
         env_file=".env",
         env_file_encoding="utf-8",
         case_sensitive=False,
+        frozen=True,  # settings are process-constant; mutation is a bug
     )
 
     # OpenAI
@@ -17,6 +18,7 @@ class Settings(BaseSettings):
     openai_embedding_model: str = "text-embedding-3-small"
     openai_embedding_dimensions: int = 1536
     openai_max_tokens_per_request: int = 2000  # per-request cap (prevents runaway agent loops)
+    embed_max_concurrency: int = 8  # embedding batches in flight per embed_batch call
 
     # Token quota tiers (tokens/month — overridable via env vars)
     token_quota_starter: int = 500_000
@@ -43,19 +45,33 @@ class Settings(BaseSettings):
     log_level: str = "INFO"
     max_retrieval_k: int = 5
     retrieval_fetch_multiplier: int = 20
+    # Optional cross-encoder re-ranker (e.g. "BAAI/bge-reranker-v2-m3").
+    # Needs the sentence-transformers extra installed; empty = BM25 re-ranking.
+    reranker_model: str = Field(default="")
+    # Skip the LLM relevance grade when the best retrieval relevance
+    # (1 - cosine distance) is at least this; 0 disables the short-circuit.
+    grade_skip_threshold: float = 0.85
+    # Threads for Docling's layout/table models during PDF extraction;
+    # 0 = let docling decide
+    docling_num_threads: int = 4
+    # Dedup digest for uploaded files: "sha256" (default) or "blake3"
+    # (optional blake3 package). Only safe to change on a fresh deployment —
+    # existing documents.file_hash rows were written with the old algorithm.
+    file_hash_algo: str = "sha256"
 
     # Web search
     tavily_api_key: str = Field(default="")
 
     # CORS (comma-separated origins, e.g. "http://localhost:3000,https://staging.example.com")
-    cors_origins: list[str] = Field(default=["*"])
+    # frozenset → the middleware's per-request origin membership check is O(1)
+    cors_origins: frozenset[str] = Field(default=frozenset({"*"}))
 
     @field_validator("cors_origins", mode="before")
     @classmethod
-    def parse_cors(cls, v: str | list) -> list[str]:
+    def parse_cors(cls, v: str | list | frozenset) -> frozenset[str]:
         if isinstance(v, str):
-            return [o.strip() for o in v.split(",") if o.strip()]
-        return v
+            return frozenset(o.strip() for o in v.split(",") if o.strip())
+        return frozenset(v)
 
 
 settings = Settings()
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
 
+import numpy as np
+
 
 @dataclass
 class LLMUsage:
@@ -27,15 +30,34 @@ class BaseLLMProvider(ABC):
     async def generate(
         self, system_prompt: str, user_message: str, **kwargs: object
     ) -> tuple[str, LLMUsage | None]:
-        """Generate a text response. Returns (answer, usage)."""
+        """Generate a text response. Returns (answer, usage).
+
+        Providers may honour a cache_key kwarg as a prompt prefix-cache hint
+        and must ignore it otherwise.
+        """
         ...
 
+    async def astream(
+        self, system_prompt: str, user_message: str, **kwargs: object
+    ) -> AsyncIterator[str]:
+        """Yield incremental answer deltas.
+
+        Default falls back to a single chunk via generate(); providers with
+        native streaming support override this for real first-token latency.
+        """
+        answer, _ = await self.generate(system_prompt, user_message, **kwargs)
+        yield answer
+
     @abstractmethod
     async def embed(self, text: str) -> list[float]:
         """Return embedding vector for a single text."""
         ...
 
     @abstractmethod
-    async def embed_batch(self, texts: list[str]) -> list[list[float]]:
-        """Return embedding vectors for a batch of texts."""
+    async def embed_batch(self, texts: list[str]) -> np.ndarray:
+        """Return embeddings as a float32 array of shape (len(texts), dims).
+
+        float32 rows cost ~7x less memory than boxed Python floats and feed
+        pgvector-python directly.
+        """
         ...
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import numpy as np
+
 from app.core.providers.base import BaseLLMProvider
 
 # TODO: implement in Phase 2 (Task 2-5 of phase2-aws.md)
@@ -15,5 +17,5 @@ class BedrockProvider(BaseLLMProvider):
     async def embed(self, text: str) -> list[float]:
         raise NotImplementedError
 
-    async def embed_batch(self, texts: list[str]) -> list[list[float]]:
+    async def embed_batch(self, texts: list[str]) -> np.ndarray:
         raise NotImplementedError
@@ -2,27 +2,88 @@ from __future__ import annotations
 
 import hashlib
 import secrets
+import time
 
 from fastapi import HTTPException
-from sqlalchemy import select
+from sqlalchemy import bindparam, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
 from app.db.models import Tenant
 
+# Built once so every execution reuses the same compiled SQL (and, with the
+# engine's prepared-statement cache, the same server-side plan)
+_TENANT_BY_HASH = (
+    select(Tenant)
+    .where(Tenant.api_key_hash == bindparam("key_hash"), Tenant.is_active.is_(True))
+    .limit(1)
+)
+
+# Short-lived {key_hash: (expires_at, Tenant)} cache — repeated calls from
+# the same tenant skip the SQL round trip. Sessions use expire_on_commit=False
+# so the detached row stays readable. The TTL bounds how long a deactivated
+# key keeps working; admin mutations also invalidate explicitly.
+_TENANT_CACHE_TTL_SECONDS = 60.0
+_TENANT_CACHE_MAX_ENTRIES = 4096
+_tenant_cache: dict[str, tuple[float, Tenant]] = {}
+
+
+def invalidate_tenant_cache(api_key_hash: str | None = None) -> None:
+    """Drop one cached tenant (by stored api_key_hash) or the whole cache."""
+    if api_key_hash is None:
+        _tenant_cache.clear()
+        return
+    _tenant_cache.pop(api_key_hash, None)
+    # Legacy pre-BLAKE2b tenants are cached under the BLAKE2b digest of the
+    # presented key while their stored api_key_hash is SHA-256 — the pop
+    # above misses them, so also match on the cached row's stored hash
+    for cache_key in [
+        k for k, (_, tenant) in _tenant_cache.items()
+        if tenant.api_key_hash == api_key_hash
+    ]:
+        del _tenant_cache[cache_key]
+
+
+def hash_api_key(key: str) -> str:
+    """Digest used for api_key_hash storage and lookup.
+
+    BLAKE2b (32-byte digest) — ~2-3x faster than SHA-256 on CPUs without
+    SHA-NI, and this runs on every authenticated request.
+    """
+    return hashlib.blake2b(key.encode(), digest_size=32).hexdigest()
+
 
 async def verify_api_key(key: str, session: AsyncSession) -> Tenant:
     """Hash the key and look it up in public.tenants. Raises 401 if not found or inactive."""
-    key_hash = hashlib.sha256(key.encode()).hexdigest()
-    result = await session.execute(
-        select(Tenant).where(
-            Tenant.api_key_hash == key_hash,
-            Tenant.is_active.is_(True),
-        )
-    )
+    key_hash = hash_api_key(key)
+
+    cached = _tenant_cache.get(key_hash)
+    if cached is not None:
+        expires_at, tenant = cached
+        if expires_at > time.monotonic():
+            return tenant
+        del _tenant_cache[key_hash]
+
+    result = await session.execute(_TENANT_BY_HASH, {"key_hash": key_hash})
     tenant = result.scalar_one_or_none()
+    if tenant is None:
+        # Legacy rows were hashed with SHA-256 before the BLAKE2b switch
+        legacy_hash = hashlib.sha256(key.encode()).hexdigest()
+        result = await session.execute(_TENANT_BY_HASH, {"key_hash": legacy_hash})
+        tenant = result.scalar_one_or_none()
     if tenant is None:
         raise HTTPException(status_code=401, detail="Invalid or inactive API key")
+
+    if len(_tenant_cache) >= _TENANT_CACHE_MAX_ENTRIES:
+        # Bound the cache under credential-guessing traffic: drop expired
+        # entries first, then fall back to clearing outright
+        now = time.monotonic()
+        for stale in [k for k, (exp, _) in _tenant_cache.items() if exp <= now]:
+            del _tenant_cache[stale]
+        if len(_tenant_cache) >= _TENANT_CACHE_MAX_ENTRIES:
+            _tenant_cache.clear()
+
+    _tenant_cache[key_hash] = (time.monotonic() + _TENANT_CACHE_TTL_SECONDS, tenant)
     return tenant
 
 
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Defaults follow the semantic-cache literature: near-duplicate prompts only.
+_DEFAULT_MAX_ENTRIES = 10_000
+_DEFAULT_TTL_SECONDS = 900.0  # 15 min — agent prompts embed doc content that can change on re-ingest
+_DEFAULT_SIMILARITY_THRESHOLD = 0.97
+
+
+class SemanticCache:
+    """In-process cache for LLM generate() responses.
+
+    Two-level lookup: an exact SHA-256 fast path over (system_prompt,
+    user_message), then cosine similarity over embeddings of recent user
+    messages (threshold ~0.97) so near-identical prompts from different
+    users also hit. Entries are scoped by namespace (tenant_id) so cached
+    answers never cross tenant boundaries.
+
+    Redis/FAISS equivalents exist for multi-process deployments; a single
+    uvicorn worker makes an in-process dict + numpy scan sufficient here.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = _DEFAULT_MAX_ENTRIES,
+        ttl_seconds: float = _DEFAULT_TTL_SECONDS,
+        similarity_threshold: float = _DEFAULT_SIMILARITY_THRESHOLD,
+    ) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._similarity_threshold = similarity_threshold
+        # exact key → (expires_at, answer)
+        self._exact: dict[str, tuple[float, str]] = {}
+        # namespace → parallel lists of (expires_at, answer) and unit vectors
+        self._entries: dict[str, list[tuple[float, str]]] = {}
+        self._vectors: dict[str, list[np.ndarray]] = {}
+
+    @staticmethod
+    def exact_key(namespace: str, system_prompt: str, user_message: str) -> str:
+        digest = hashlib.sha256(
+            f"{namespace}\x00{system_prompt}\x00{user_message}".encode()
+        ).hexdigest()
+        return digest
+
+    def get_exact(self, key: str) -> str | None:
+        hit = self._exact.get(key)
+        if hit is None:
+            return None
+        expires_at, answer = hit
+        if expires_at < time.monotonic():
+            del self._exact[key]
+            return None
+        return answer
+
+    def get_semantic(self, namespace: str, embedding: list[float]) -> str | None:
+        entries = self._entries.get(namespace)
+        if not entries:
+            return None
+        self._evict_expired(namespace)
+        entries = self._entries.get(namespace)
+        if not entries:
+            return None
+        query = _unit(np.asarray(embedding, dtype=np.float32))
+        sims = np.stack(self._vectors[namespace]) @ query
+        best = int(np.argmax(sims))
+        if float(sims[best]) < self._similarity_threshold:
+            return None
+        return entries[best][1]
+
+    def put(
+        self,
+        namespace: str,
+        key: str,
+        embedding: list[float] | None,
+        answer: str,
+    ) -> None:
+        expires_at = time.monotonic() + self._ttl_seconds
+        self._exact[key] = (expires_at, answer)
+        if len(self._exact) > self._max_entries:
+            # Drop the oldest half rather than tracking LRU order per hit
+            cutoff = sorted(v[0] for v in self._exact.values())[len(self._exact) // 2]
+            self._exact = {k: v for k, v in self._exact.items() if v[0] > cutoff}
+        if embedding is None:
+            return
+        entries = self._entries.setdefault(namespace, [])
+        vectors = self._vectors.setdefault(namespace, [])
+        entries.append((expires_at, answer))
+        vectors.append(_unit(np.asarray(embedding, dtype=np.float32)))
+        if len(entries) > self._max_entries:
+            del entries[: len(entries) // 2]
+            del vectors[: len(vectors) // 2]
+
+    def clear(self) -> None:
+        self._exact.clear()
+        self._entries.clear()
+        self._vectors.clear()
+
+    def _evict_expired(self, namespace: str) -> None:
+        now = time.monotonic()
+        entries = self._entries[namespace]
+        if entries and entries[0][0] < now:
+            keep = [i for i, (exp, _) in enumerate(entries) if exp >= now]
+            self._entries[namespace] = [entries[i] for i in keep]
+            vectors = self._vectors[namespace]
+            self._vectors[namespace] = [vectors[i] for i in keep]
+
+
+def _unit(vec: np.ndarray) -> np.ndarray:
+    norm = float(np.linalg.norm(vec))
+    return vec / norm if norm else vec
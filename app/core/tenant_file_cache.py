@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+"""File-backed tenant lookup cache for the CLI scripts.
+
+Chained dev/CI runs (ingest → validate → query) repeat the same
+api-key → tenant lookup in separate processes, where the in-memory TTL
+cache in app.core.security can't help. This caches the resolved tenant
+row in ~/.cache/ea-rag/tenant.json keyed by the key hash, so warm script
+runs skip the DB round trip entirely.
+
+Dev-CLI only — the API request path keeps using the in-memory cache.
+Entries expire after a short TTL (a stale `config` would bypass e.g.
+updated restricted_doc_types); delete the file or call clear() to
+invalidate sooner.
+"""
+
+import logging
+import os
+import time
+from pathlib import Path
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+_CACHE_TTL_SECONDS = 600.0
+
+_cache_path = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    / "ea-rag"
+    / "tenant.json"
+)
+
+
+def get(key_hash: str) -> dict | None:
+    """Return the cached tenant row for this key hash, or None if absent/expired."""
+    try:
+        entries = orjson.loads(_cache_path.read_bytes())
+        entry = entries.get(key_hash)
+        if entry and time.time() < entry["expires_at"]:
+            return entry["tenant"]
+    except (OSError, orjson.JSONDecodeError, KeyError, TypeError):
+        pass  # unreadable/corrupt cache behaves like a miss
+    return None
+
+
+def put(key_hash: str, tenant_row: dict) -> None:
+    """Write back a freshly resolved tenant row (best-effort)."""
+    try:
+        entries = orjson.loads(_cache_path.read_bytes())
+        if not isinstance(entries, dict):
+            entries = {}
+    except (OSError, orjson.JSONDecodeError):
+        entries = {}
+    entries[key_hash] = {
+        "expires_at": time.time() + _CACHE_TTL_SECONDS,
+        "tenant": tenant_row,
+    }
+    try:
+        _cache_path.parent.mkdir(parents=True, exist_ok=True)
+        _cache_path.write_bytes(orjson.dumps(entries))
+    except OSError:
+        logger.warning("tenant_file_cache: write failed", exc_info=True)
+
+
+def clear() -> None:
+    """Drop the whole cache file."""
+    try:
+        _cache_path.unlink(missing_ok=True)
+    except OSError:
+        logger.warning("tenant_file_cache: clear failed", exc_info=True)
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+"""Shared raw-asyncpg pool for the CLI scripts.
+
+Each one-shot ``asyncpg.connect()`` pays TLS + auth + startup handshake;
+scripts that run several DB steps in one process (or are driven from a
+REPL/loop) reuse warm connections through this module-level pool instead.
+
+The FastAPI request path does NOT use this — it goes through the
+SQLAlchemy engine in app/db/session.py, which pools on its own.
+"""
+
+import asyncio
+import atexit
+import logging
+
+import asyncpg
+from pgvector.asyncpg import register_vector
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_DB_URL = settings.database_url.replace("postgresql+asyncpg://", "postgresql://")
+
+_pool: asyncpg.Pool | None = None
+
+
+async def _init_connection(conn: asyncpg.Connection) -> None:
+    # pgvector's binary codecs, once per pooled connection: embeddings bind
+    # as raw float32 instead of ~20 KB of ASCII per 1536-dim vector, so any
+    # bulk load through this pool skips the server-side text parse too
+    try:
+        await register_vector(conn)
+    except Exception:
+        # e.g. first connect during setup_db before CREATE EXTENSION vector
+        logger.warning("pgvector codec registration skipped", exc_info=True)
+
+
+async def get_pool() -> asyncpg.Pool:
+    """Return the process-wide asyncpg pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        _pool = await asyncpg.create_pool(
+            _DB_URL,
+            min_size=1,
+            max_size=4,
+            statement_cache_size=1024,
+            max_inactive_connection_lifetime=300,
+            init=_init_connection,
+        )
+    return _pool
+
+
+async def close_all_pools() -> None:
+    """Close the pool (idempotent). Registered via atexit for the scripts."""
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+
+def _close_at_exit() -> None:
+    if _pool is not None:
+        try:
+            asyncio.run(close_all_pools())
+        except Exception:
+            # Pool was created on a loop that is already torn down —
+            # connections die with the process anyway
+            pass
+
+
+atexit.register(_close_at_exit)
@@ -4,11 +4,29 @@ import logging
 
 from sqlalchemy import text
 
+from app.config import settings
 from app.db.session import async_engine
 
 logger = logging.getLogger(__name__)
 
 
+def _extversion_tuple(extversion: str) -> tuple[int, ...]:
+    try:
+        return tuple(int(p) for p in extversion.split(".")[:2])
+    except ValueError:
+        return (0,)
+
+
+def _supports_hnsw(extversion: str) -> bool:
+    """pgvector >= 0.5 ships the HNSW access method."""
+    return _extversion_tuple(extversion) >= (0, 5)
+
+
+def _supports_halfvec(extversion: str) -> bool:
+    """pgvector >= 0.7 ships the halfvec (fp16) type."""
+    return _extversion_tuple(extversion) >= (0, 7)
+
+
 async def create_tenant_schema(schema_name: str) -> None:
     """Create per-tenant PostgreSQL schema with all required tables and indexes.
 
@@ -66,11 +84,55 @@ async def create_tenant_schema(schema_name: str) -> None:
             )
         """))
 
+        # HNSW (graph-based, no training, better recall/latency than IVFFlat)
+        # when pgvector supports it; older extensions fall back to IVFFlat.
+        result = await conn.execute(
+            text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+        )
+        extversion = result.scalar_one_or_none() or "0"
+        if _supports_halfvec(extversion):
+            # Index the fp16 cast: the stored column stays lossless float32,
+            # but the HNSW graph scans half the bytes per candidate. Queries
+            # must ORDER BY the same cast expression to use this index.
+            dims = settings.openai_embedding_dimensions
+            await conn.execute(text(f"""
+                CREATE INDEX IF NOT EXISTS idx_{schema_name}_chunks_embedding
+                    ON {schema_name}.chunks
+                    USING hnsw ((embedding::halfvec({dims})) halfvec_cosine_ops)
+                    WITH (m = 16, ef_construction = 64)
+            """))
+        elif _supports_hnsw(extversion):
+            await conn.execute(text(f"""
+                CREATE INDEX IF NOT EXISTS idx_{schema_name}_chunks_embedding
+                    ON {schema_name}.chunks
+                    USING hnsw (embedding vector_cosine_ops)
+                    WITH (m = 16, ef_construction = 64)
+            """))
+        else:
+            # IVFFlat trains centroids from existing rows, so building it on
+            # an empty table wastes the build and pins lists to a guess.
+            # scripts/build_ann_index.py sizes lists from the real row count
+            # and builds CONCURRENTLY after the first bulk load.
+            logger.warning(
+                "pgvector %s lacks HNSW — deferring ANN index for %s to "
+                "scripts/build_ann_index.py after first ingest",
+                extversion,
+                schema_name,
+            )
+
+        # Generated tsvector + GIN index: keyword relevance is computed by
+        # Postgres' C-level ts_rank_cd in the same query as the vector scan
+        # instead of re-tokenizing candidates in Python per request
+        await conn.execute(text(f"""
+            ALTER TABLE {schema_name}.chunks
+                ADD COLUMN IF NOT EXISTS content_tsv tsvector
+                GENERATED ALWAYS AS (
+                    to_tsvector('english', coalesce(heading, '') || ' ' || content)
+                ) STORED
+        """))
         await conn.execute(text(f"""
-            CREATE INDEX IF NOT EXISTS idx_{schema_name}_chunks_embedding
-                ON {schema_name}.chunks
-                USING ivfflat (embedding vector_cosine_ops)
-                WITH (lists = 100)
+            CREATE INDEX IF NOT EXISTS idx_{schema_name}_chunks_content_tsv
+                ON {schema_name}.chunks USING gin (content_tsv)
         """))
 
         await conn.execute(text(f"""
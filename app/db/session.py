@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+import functools
+import logging
 from collections.abc import AsyncGenerator
 
+import orjson
+from pgvector.asyncpg import register_vector
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
@@ -10,10 +15,28 @@ from sqlalchemy.ext.asyncio import (
 
 from app.config import settings
 
+
+def _json_serializer(value: object) -> str:
+    return orjson.dumps(value).decode()
+
+
 async_engine = create_async_engine(
     settings.database_url,
     echo=False,
     pool_pre_ping=True,
+    pool_size=20,
+    max_overflow=10,
+    pool_recycle=1800,
+    # orjson for JSONB columns (tenants.config is read on every request) —
+    # 3-5x faster than the stdlib serializer SQLAlchemy defaults to
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
+    # Server-side prepared-statement reuse: hot queries (tenant auth runs on
+    # every request) skip Postgres parse+plan after first execution
+    connect_args={
+        "prepared_statement_cache_size": 512,
+        "statement_cache_size": 1024,
+    },
 )
 
 AsyncSessionLocal = async_sessionmaker(
@@ -23,17 +46,38 @@ AsyncSessionLocal = async_sessionmaker(
 )
 
 
+logger = logging.getLogger(__name__)
+
+
+async def _register_pgvector(conn) -> None:
+    try:
+        await register_vector(conn)
+    except Exception:
+        # e.g. first connect during setup_db before CREATE EXTENSION vector
+        logger.warning("pgvector codec registration skipped", exc_info=True)
+
+
+@event.listens_for(async_engine.sync_engine, "connect")
+def _on_connect(dbapi_connection, connection_record) -> None:
+    # Register pgvector's binary codecs once per pooled connection so query
+    # vectors bind as raw float32 instead of ~15 KB of ASCII per query
+    dbapi_connection.run_async(_register_pgvector)
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
         yield session
 
 
+@functools.lru_cache(maxsize=128)
 def tenant_session(schema_name: str) -> async_sessionmaker[AsyncSession]:
     """Return a sessionmaker scoped to the given tenant schema.
 
-    Creates a new engine proxy with schema_translate_map applied so all
+    Creates an engine proxy with schema_translate_map applied so all
     queries for per-tenant models (Document, Chunk, IngestJob) are routed
-    to the correct schema automatically.
+    to the correct schema automatically. Proxy + sessionmaker are memoized
+    per schema (they share async_engine's connection pool, so there is
+    nothing tenant-specific to tear down) instead of rebuilt per request.
 
     Usage::
 
@@ -3,13 +3,13 @@ from __future__ import annotations
 from collections.abc import AsyncGenerator
 
 from fastapi import Depends, Header
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.core.providers.base import BaseLLMProvider
 from app.core.providers.openai_provider import OpenAIProvider
 from app.core.security import verify_admin_key, verify_api_key
 from app.db.models import Tenant
-from app.db.session import AsyncSessionLocal
+from app.db.session import AsyncSessionLocal, tenant_session
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
@@ -26,6 +26,18 @@ async def get_tenant(
     return await verify_api_key(x_api_key, session)
 
 
+def get_tenant_session_maker(
+    tenant: Tenant = Depends(get_tenant),
+) -> async_sessionmaker[AsyncSession]:
+    """Tenant-scoped sessionmaker as a dependency.
+
+    Routes that work inside the tenant schema take this instead of calling
+    tenant_session() directly, so tests swap it with one dict write in
+    app.dependency_overrides rather than patching module attributes.
+    """
+    return tenant_session(tenant.schema_name)
+
+
 async def get_admin(
     x_admin_key: str = Header(..., alias="X-Admin-Key"),
 ) -> None:
@@ -33,11 +45,20 @@ async def get_admin(
     verify_admin_key(x_admin_key)
 
 
+# Providers are stateless wrappers over shared clients — one instance per
+# sovereignty flavour, reused across requests instead of allocated per call
+_providers: dict[str, BaseLLMProvider] = {}
+
+
 def get_provider(tenant: Tenant = Depends(get_tenant)) -> BaseLLMProvider:
     """Return the appropriate LLM provider for this tenant.
 
-    Phase 1: always returns OpenAIProvider.
+    Phase 1: always returns the shared OpenAIProvider.
     Phase 2 (data_sovereignty=AU): will return BedrockProvider — see docs/phase2-aws.md.
     """
-    # TODO Phase 2: if tenant.config.get("data_sovereignty") == "AU": return BedrockProvider()
-    return OpenAIProvider()
+    key = (tenant.config or {}).get("data_sovereignty", "default")
+    provider = _providers.get(key)
+    if provider is None:
+        # TODO Phase 2: if key == "AU": provider = BedrockProvider()
+        provider = _providers.setdefault(key, OpenAIProvider())
+    return provider
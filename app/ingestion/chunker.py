@@ -10,6 +10,10 @@ from app.ingestion.pdf_extractor import PageContent
 _ENCODER = tiktoken.get_encoding("cl100k_base")
 _HEADING_RE = re.compile(r"^#{1,6}\s+(.+)$", re.MULTILINE)
 
+# Docling puts page headings at the top of the markdown — scanning the whole
+# page for one is wasted work
+_HEADING_SCAN_CHARS = 512
+
 
 @dataclass
 class ChunkData:
@@ -21,22 +25,33 @@ class ChunkData:
 
 
 def chunk_pages(pages: list[PageContent]) -> list[ChunkData]:
-    """Convert per-page markdown into ChunkData records (one chunk per non-empty page)."""
-    chunks: list[ChunkData] = []
+    """Convert per-page markdown into ChunkData records (one chunk per non-empty page).
+
+    Tokenization goes through encode_ordinary_batch: one FFI call for the
+    whole document lets tiktoken parallelise across pages instead of paying
+    per-page call overhead.
+    """
+    kept: list[tuple[int, str]] = []
     for page in pages:
         content = page.markdown_text.strip()
-        if not content:
-            continue
-        heading_match = _HEADING_RE.search(content)
+        if content:
+            kept.append((page.page_number, content))
+    if not kept:
+        return []
+
+    token_lists = _ENCODER.encode_ordinary_batch([content for _, content in kept])
+
+    chunks: list[ChunkData] = []
+    for (page_number, content), tokens in zip(kept, token_lists):
+        heading_match = _HEADING_RE.search(content[:_HEADING_SCAN_CHARS])
         heading = heading_match.group(1).strip() if heading_match else None
-        token_count = len(_ENCODER.encode(content))
         chunks.append(
             ChunkData(
-                page_number=page.page_number,
+                page_number=page_number,
                 chunk_index=0,
                 heading=heading,
                 content=content,
-                token_count=token_count,
+                token_count=len(tokens),
             )
         )
     return chunks
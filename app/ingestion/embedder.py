@@ -1,16 +1,57 @@
 from __future__ import annotations
 
+from collections.abc import AsyncIterator
+
+import numpy as np
+
 from app.core.providers.base import BaseLLMProvider
 from app.ingestion.chunker import ChunkData
 
+# Chunks embedded (and handed to the caller for insert) per step — bounds
+# peak memory to one batch of texts + vectors instead of the whole document
+_STREAM_BATCH_SIZE = 100
+# Batches are also packed by token budget (chunker already counted tokens)
+# so one request can't blow the embeddings API's per-request token limit
+_STREAM_BATCH_TOKENS = 100_000
+
 
 async def embed_chunks(
     chunks: list[ChunkData],
     provider: BaseLLMProvider,
-) -> list[list[float]]:
-    """Return embedding vectors for each chunk, in the same order.
+) -> np.ndarray:
+    """Return a float32 embedding matrix, one row per chunk, in order.
 
     Batching is handled inside provider.embed_batch() (100 texts per call).
+    Prefer embed_chunks_stream for ingest — it avoids materialising every
+    text and vector at once.
     """
     texts = [chunk.content for chunk in chunks]
     return await provider.embed_batch(texts)
+
+
+async def embed_chunks_stream(
+    chunks: list[ChunkData],
+    provider: BaseLLMProvider,
+    batch_size: int = _STREAM_BATCH_SIZE,
+) -> AsyncIterator[tuple[list[ChunkData], np.ndarray]]:
+    """Yield (chunk_batch, vectors) pairs, embedding one batch at a time.
+
+    The caller inserts each batch before the next is embedded, so peak
+    memory is O(batch_size) rather than O(total_chunks) — on a 1000-page
+    document that's the difference between one batch and the whole text
+    corpus plus its float matrix resident simultaneously. Batches close
+    early when their summed token_count reaches _STREAM_BATCH_TOKENS.
+    """
+    batch: list[ChunkData] = []
+    batch_tokens = 0
+    for chunk in chunks:
+        if batch and (
+            len(batch) >= batch_size
+            or batch_tokens + (chunk.token_count or 0) > _STREAM_BATCH_TOKENS
+        ):
+            yield batch, await provider.embed_batch([c.content for c in batch])
+            batch, batch_tokens = [], 0
+        batch.append(chunk)
+        batch_tokens += chunk.token_count or 0
+    if batch:
+        yield batch, await provider.embed_batch([c.content for c in batch])
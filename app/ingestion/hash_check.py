@@ -1,16 +1,37 @@
 from __future__ import annotations
 
 import hashlib
+import logging
 import uuid
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.db.models import Document
 
+logger = logging.getLogger(__name__)
+
 
 def compute_hash(pdf_bytes: bytes) -> str:
-    """Return SHA-256 hex digest of raw PDF bytes."""
+    """Return the dedup digest of raw PDF bytes (hex).
+
+    SHA-256 by default — file_hash values in documents.file_hash must stay
+    comparable across ingests, so the algorithm is a deployment-wide choice.
+    FILE_HASH_ALGO=blake3 opts into the optional blake3 package (~6-10x
+    faster on multi-MB PDFs, SIMD + multithreaded, releases the GIL) for
+    fresh deployments that never wrote SHA-256 rows.
+    """
+    if settings.file_hash_algo == "blake3":
+        try:
+            import blake3
+        except ImportError:
+            logger.warning(
+                "hash_check: FILE_HASH_ALGO=blake3 but the blake3 package is "
+                "not installed — falling back to sha256"
+            )
+        else:
+            return blake3.blake3(pdf_bytes, max_threads=blake3.blake3.AUTO).hexdigest()
     return hashlib.sha256(pdf_bytes).hexdigest()
 
 
@@ -2,9 +2,16 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 
 
+@lru_cache(maxsize=256)
+def _compiled(pattern: str) -> re.Pattern[str]:
+    """Per-tenant doc_number patterns, compiled once per process."""
+    return re.compile(pattern)
+
+
 @dataclass
 class DocumentMetadata:
     doc_number: str | None = None
@@ -40,7 +47,7 @@ def parse_filename(filename: str, tenant_config: dict) -> DocumentMetadata:
     pattern = tenant_config.get("doc_number_pattern")
 
     if pattern:
-        match = re.search(pattern, stem)
+        match = _compiled(pattern).search(stem)
         if match:
             doc_number = match.group(1)
             doc_type = _derive_doc_type(doc_number)
@@ -52,12 +59,18 @@ def parse_filename(filename: str, tenant_config: dict) -> DocumentMetadata:
     return DocumentMetadata()
 
 
-# Patterns for page-1 structured header fields (case-insensitive)
-_HEADER_PATTERNS: dict[str, str] = {
-    "doc_number": r"(?:document\s+(?:number|no\.?)|doc\.?\s*(?:no\.?|number))\s*[:\-]?\s*([A-Z0-9][A-Z0-9\-]+)",
-    "revision": r"(?:revision|rev\.?)\s*[:\-]?\s*([A-Z0-9][A-Z0-9\.\-]*)",
-    "classification": r"(?:classification|security\s+classification)\s*[:\-]?\s*([A-Z][A-Z\s]+?)(?:\n|$)",
-}
+# Page-1 structured header fields, unioned into one precompiled alternation
+# (named group per field) so the markdown is scanned once, not once per field
+_HEADER_RE = re.compile(
+    "|".join(
+        (
+            r"(?:document\s+(?:number|no\.?)|doc\.?\s*(?:no\.?|number))\s*[:\-]?\s*(?P<doc_number>[A-Z0-9][A-Z0-9\-]+)",
+            r"(?:revision|rev\.?)\s*[:\-]?\s*(?P<revision>[A-Z0-9][A-Z0-9\.\-]*)",
+            r"(?:classification|security\s+classification)\s*[:\-]?\s*(?P<classification>[A-Z][A-Z\s]+?)(?:\n|$)",
+        )
+    ),
+    re.IGNORECASE,
+)
 
 
 def parse_page1_header(page1_markdown: str, tenant_config: dict) -> dict:  # noqa: ARG001
@@ -66,10 +79,19 @@ def parse_page1_header(page1_markdown: str, tenant_config: dict) -> dict:  # noq
     `tenant_config` is accepted for future extensibility (custom patterns).
     Returns a dict with keys: doc_number, revision, classification (any may be None).
     """
-    result: dict[str, str | None] = {}
-    for field_name, pattern in _HEADER_PATTERNS.items():
-        m = re.search(pattern, page1_markdown, re.IGNORECASE)
-        result[field_name] = m.group(1).strip() if m else None
+    result: dict[str, str | None] = {
+        "doc_number": None,
+        "revision": None,
+        "classification": None,
+    }
+    remaining = len(result)
+    for m in _HEADER_RE.finditer(page1_markdown):
+        field_name = m.lastgroup
+        if field_name and result[field_name] is None:
+            result[field_name] = m.group(field_name).strip()
+            remaining -= 1
+            if not remaining:
+                break
     return result
 
 
@@ -1,24 +1,66 @@
 from __future__ import annotations
 
 import asyncio
-import tempfile
+import io
+import threading
 from dataclasses import dataclass
-from pathlib import Path
 
-from docling.document_converter import DocumentConverter
+from docling.backend.pypdfium2_backend import PyPdfiumDocumentBackend
+from docling.datamodel.base_models import DocumentStream, InputFormat
+from docling.datamodel.pipeline_options import AcceleratorOptions, PdfPipelineOptions
+from docling.document_converter import DocumentConverter, PdfFormatOption
+
+from app.config import settings
 
 _PAGE_BREAK = "<!-- page break -->"
 
+# DocumentConverter construction loads models (>1s) — build once per process.
+# The lock guards first-build races between asyncio.to_thread workers.
+_converter: DocumentConverter | None = None
+_converter_lock = threading.Lock()
+
 
-@dataclass
+# slots skips the per-instance __dict__; frozen makes pages hashable for
+# any downstream memoization. Internal carrier, so no validation needed.
+@dataclass(slots=True, frozen=True)
 class PageContent:
     page_number: int  # 1-indexed
     markdown_text: str
 
 
-def _extract_sync(pdf_path: Path) -> list[PageContent]:
-    converter = DocumentConverter()
-    result = converter.convert(str(pdf_path))
+def _pipeline_options() -> PdfPipelineOptions:
+    options = PdfPipelineOptions(do_ocr=False, do_table_structure=True)
+    if settings.docling_num_threads > 0:
+        # Intra-document parallelism for the layout/table models; docling
+        # 2.14 has no ThreadedPdfPipeline yet, so accelerator threads are
+        # the available knob. Keep uvicorn workers low to avoid
+        # oversubscription.
+        options.accelerator_options = AcceleratorOptions(
+            num_threads=settings.docling_num_threads
+        )
+    return options
+
+
+def _get_converter() -> DocumentConverter:
+    global _converter
+    if _converter is None:
+        with _converter_lock:
+            if _converter is None:
+                # pypdfium backend: ~2x throughput and less than half the RSS
+                # of the default docling-parse backend on text-heavy PDFs
+                _converter = DocumentConverter(
+                    format_options={
+                        InputFormat.PDF: PdfFormatOption(
+                            backend=PyPdfiumDocumentBackend,
+                            pipeline_options=_pipeline_options(),
+                        )
+                    }
+                )
+    return _converter
+
+
+def _extract_sync(source: DocumentStream) -> list[PageContent]:
+    result = _get_converter().convert(source)
     markdown = result.document.export_to_markdown(page_break_placeholder=_PAGE_BREAK)
     raw_pages = markdown.split(_PAGE_BREAK)
     pages: list[PageContent] = []
@@ -27,11 +69,12 @@ def _extract_sync(pdf_path: Path) -> list[PageContent]:
     return pages
 
 
-async def extract_pages(pdf_bytes: bytes) -> list[PageContent]:
-    """Extract per-page markdown from PDF bytes using Docling."""
-    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=True) as tmp:
-        tmp.write(pdf_bytes)
-        tmp.flush()
-        pdf_path = Path(tmp.name)
-        pages = await asyncio.to_thread(_extract_sync, pdf_path)
-    return pages
+async def extract_pages(pdf_bytes: bytes, filename: str = "upload.pdf") -> list[PageContent]:
+    """Extract per-page markdown from PDF bytes using Docling.
+
+    Bytes are handed to Docling as a DocumentStream — no temp-file
+    round-trip, which for large PDFs meant a full extra write+read through
+    the kernel before parsing could start.
+    """
+    source = DocumentStream(name=filename, stream=io.BytesIO(pdf_bytes))
+    return await asyncio.to_thread(_extract_sync, source)
@@ -1,18 +1,24 @@
 from __future__ import annotations
 
 import asyncio
+import functools
+import io
 import logging
 import uuid
 
 import boto3
+import numpy as np
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config as BotoConfig
 from botocore.exceptions import BotoCoreError, ClientError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
 from app.core.providers.openai_provider import OpenAIProvider
-from app.db.models import Chunk, Document, IngestJob
+from app.db.models import Document, IngestJob
 from app.db.session import tenant_session
-from app.ingestion.chunker import chunk_pages
-from app.ingestion.embedder import embed_chunks
+from app.ingestion.chunker import ChunkData, chunk_pages
+from app.ingestion.embedder import embed_chunks_stream
 from app.ingestion.hash_check import compute_hash, find_existing
 from app.ingestion.metadata_parser import parse
 from app.ingestion.pdf_extractor import extract_pages
@@ -20,19 +26,97 @@ from app.ingestion.pdf_extractor import extract_pages
 logger = logging.getLogger(__name__)
 
 
-def _s3_upload(pdf_bytes: bytes, s3_key: str) -> None:
-    """Synchronous S3 upload — run in a thread via asyncio.to_thread()."""
-    client = boto3.client(
+_CHUNK_COPY_COLUMNS = (
+    "document_id",
+    "page_number",
+    "chunk_index",
+    "heading",
+    "content",
+    "embedding",
+    "token_count",
+)
+
+
+async def _copy_chunk_batch(
+    ts: AsyncSession,
+    schema_name: str,
+    document_id: uuid.UUID,
+    batch: list[ChunkData],
+    vectors: np.ndarray,
+) -> None:
+    """Bulk-insert a chunk batch with asyncpg's binary COPY.
+
+    COPY in binary wire format skips per-row INSERT parsing and sends
+    embeddings as raw float32 instead of text — roughly an order of
+    magnitude less server-side parse cost and client→server bytes than
+    ORM INSERT ... VALUES for large documents. Runs on the session's
+    connection (pgvector codecs are registered pool-wide at connect), so
+    it joins the surrounding transaction. id/created_at are omitted and
+    take their column defaults.
+    """
+    conn = await ts.connection()
+    raw = await conn.get_raw_connection()
+    driver_conn = raw.driver_connection
+
+    records = [
+        (
+            document_id,
+            c.page_number,
+            c.chunk_index,
+            c.heading,
+            c.content,
+            vectors[i],
+            c.token_count,
+        )
+        for i, c in enumerate(batch)
+    ]
+    await driver_conn.copy_records_to_table(
+        "chunks",
+        records=records,
+        columns=_CHUNK_COPY_COLUMNS,
+        schema_name=schema_name,
+    )
+
+
+# A stuck PUT shouldn't stall an ingest job forever
+_S3_UPLOAD_TIMEOUT_SECONDS = 120.0
+
+_S3_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=10,
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _s3_client():
+    """One S3 client per process — construction walks the credential chain
+    and builds an SSL context (easily 100ms+), and reuse keeps the
+    connection pool warm across ingests."""
+    return boto3.client(
         "s3",
         region_name=settings.aws_region,
         aws_access_key_id=settings.aws_access_key_id or None,
         aws_secret_access_key=settings.aws_secret_access_key or None,
+        config=BotoConfig(
+            max_pool_connections=64,
+            retries={"mode": "adaptive", "max_attempts": 5},
+            tcp_keepalive=True,
+        ),
     )
-    client.put_object(
-        Bucket=settings.s3_bucket_name,
-        Key=s3_key,
-        Body=pdf_bytes,
-        ContentType="application/pdf",
+
+
+def _s3_upload(pdf_bytes: bytes, s3_key: str) -> None:
+    """Synchronous S3 upload — run in a thread via asyncio.to_thread().
+
+    upload_fileobj goes multipart with parallel part PUTs past 8 MB.
+    """
+    _s3_client().upload_fileobj(
+        io.BytesIO(pdf_bytes),
+        settings.s3_bucket_name,
+        s3_key,
+        ExtraArgs={"ContentType": "application/pdf"},
+        Config=_S3_TRANSFER_CONFIG,
     )
 
 
@@ -68,18 +152,33 @@ async def run_pipeline(
                 logger.info("Skipped duplicate document %s (job %s)", file_hash[:12], job_id)
                 return
 
-            # 2. S3 upload (skipped in development)
+            # 2+3. S3 upload (pure network) overlaps Docling extraction
+            # (CPU in a worker thread) — they share no bottleneck, so the
+            # PUT time disappears from the critical path. Upload failures
+            # still abort before anything is inserted.
             s3_key = f"{s3_prefix}{file_hash}/{filename}"
+            upload_task: asyncio.Task | None = None
             if settings.app_env != "development":
-                try:
-                    await asyncio.to_thread(_s3_upload, pdf_bytes, s3_key)
-                except (BotoCoreError, ClientError) as exc:
-                    raise RuntimeError(f"S3 upload failed: {exc}") from exc
+                upload_task = asyncio.create_task(
+                    asyncio.to_thread(_s3_upload, pdf_bytes, s3_key)
+                )
             else:
                 logger.info("Development mode — skipping S3 upload, s3_key=%s", s3_key)
 
-            # 3. Extract pages with Docling
-            pages = await extract_pages(pdf_bytes)
+            try:
+                pages = await extract_pages(pdf_bytes, filename)
+            except BaseException:
+                if upload_task is not None:
+                    upload_task.cancel()
+                raise
+
+            if upload_task is not None:
+                try:
+                    await asyncio.wait_for(upload_task, timeout=_S3_UPLOAD_TIMEOUT_SECONDS)
+                except (BotoCoreError, ClientError) as exc:
+                    raise RuntimeError(f"S3 upload failed: {exc}") from exc
+                except asyncio.TimeoutError as exc:
+                    raise RuntimeError("S3 upload timed out") from exc
 
             # 4. Parse metadata from filename + page 1
             page1_text = pages[0].markdown_text if pages else ""
@@ -88,11 +187,9 @@ async def run_pipeline(
             # 5. Chunk pages
             chunks = chunk_pages(pages)
 
-            # 6. Generate embeddings
+            # 6+7. Embed and insert in streaming batches (one transaction) —
+            # peak memory stays at one batch of texts + vectors
             provider = OpenAIProvider()
-            vectors = await embed_chunks(chunks, provider)
-
-            # 7. Insert Document + Chunks in one transaction
             doc = Document(
                 file_hash=file_hash,
                 filename=filename,
@@ -109,19 +206,29 @@ async def run_pipeline(
             ts.add(doc)
             await ts.flush()  # get doc.id before commit
 
-            chunk_rows = [
-                Chunk(
-                    document_id=doc.id,
-                    page_number=c.page_number,
-                    chunk_index=c.chunk_index,
-                    heading=c.heading,
-                    content=c.content,
-                    embedding=vectors[i],
-                    token_count=c.token_count,
-                )
-                for i, c in enumerate(chunks)
-            ]
-            ts.add_all(chunk_rows)
+            # Producer/consumer split: the OpenAI embed RTT for batch N+1
+            # overlaps the COPY of batch N. The bounded queue applies
+            # backpressure so a slow insert can't pile up float matrices.
+            batch_queue: asyncio.Queue = asyncio.Queue(maxsize=4)
+
+            async def _embed_producer() -> None:
+                try:
+                    async for item in embed_chunks_stream(chunks, provider):
+                        await batch_queue.put(item)
+                finally:
+                    await batch_queue.put(None)
+
+            producer = asyncio.create_task(_embed_producer())
+            chunk_count = 0
+            try:
+                while (item := await batch_queue.get()) is not None:
+                    batch, vectors = item
+                    await _copy_chunk_batch(ts, schema_name, doc.id, batch, vectors)
+                    chunk_count += len(batch)
+            finally:
+                if not producer.done():
+                    producer.cancel()
+            await producer
 
             # 8. Update job → completed
             job = await ts.get(IngestJob, job_id)
@@ -133,7 +240,7 @@ async def run_pipeline(
             logger.info(
                 "Ingest completed: doc_id=%s chunks=%d job=%s",
                 doc.id,
-                len(chunk_rows),
+                chunk_count,
                 job_id,
             )
 
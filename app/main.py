@@ -7,10 +7,21 @@ from typing import Any
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.api.v1.router import router as api_router
 from app.config import settings
 
+try:
+    import uvloop
+except ImportError:  # pragma: no cover — uvloop ships with uvicorn[standard] on Linux
+    uvloop = None  # type: ignore[assignment]
+else:
+    # uvicorn auto-selects uvloop, but installing the policy here covers every
+    # entrypoint (scripts, embedded servers) — libuv cuts per-await overhead
+    # across the agent's many small I/O hops.
+    uvloop.install()
+
 
 def _configure_logging() -> None:
     logging.basicConfig(
@@ -25,6 +36,10 @@ async def lifespan(app: FastAPI):  # type: ignore[type-arg]
     logger = logging.getLogger(__name__)
     logger.info("Starting RAG System API", extra={"env": settings.app_env})
     yield
+    # Drain the shared connection pool (tenant engine proxies reuse it)
+    from app.db.session import async_engine
+
+    await async_engine.dispose()
     logger.info("Shutting down RAG System API")
 
 
@@ -33,6 +48,9 @@ app = FastAPI(
     version="1.0.0",
     description="Multi-tenant document intelligence system",
     lifespan=lifespan,
+    # orjson serializes response bodies (datetimes, UUIDs, nested dicts)
+    # 3-5x faster than the stdlib json default
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import time
+from typing import Any
+from uuid import UUID
+
+from app.config import settings
+from app.schemas.retrieval import RetrievedChunk
+
+logger = logging.getLogger(__name__)
+
+# Only the first 512 chars of a chunk are scored — cross-encoders truncate
+# anyway and shorter pairs keep CPU inference latency bounded.
+_PAIR_CONTENT_CHARS = 512
+_SCORE_CACHE_TTL_SECONDS = 900.0
+_SCORE_CACHE_MAX_ENTRIES = 10_000
+
+# (query, chunk_id) → (expires_at, score); chunk content is immutable per id.
+# Bounded like the other process caches: expired keys are purged on insert
+# and the cache is cleared outright if live entries alone exceed the cap.
+_score_cache: dict[tuple[str, UUID], tuple[float, float]] = {}
+
+
+def enabled() -> bool:
+    """True when a reranker model is configured and sentence-transformers is installed."""
+    return bool(settings.reranker_model) and _load_model() is not None
+
+
+@functools.cache
+def _load_model() -> Any | None:
+    """Load the configured CrossEncoder once per process.
+
+    sentence-transformers is an optional dependency — if it (or the model)
+    is unavailable the retriever silently keeps its BM25 re-ranking.
+    """
+    if not settings.reranker_model:
+        return None
+    try:
+        from sentence_transformers import CrossEncoder
+    except ImportError:
+        logger.warning(
+            "cross_encoder: RERANKER_MODEL=%s set but sentence-transformers "
+            "is not installed — falling back to BM25",
+            settings.reranker_model,
+        )
+        return None
+    try:
+        model = CrossEncoder(settings.reranker_model)
+    except Exception:
+        logger.exception("cross_encoder: failed to load %s", settings.reranker_model)
+        return None
+    logger.info("cross_encoder: loaded %s", settings.reranker_model)
+    return model
+
+
+async def rerank(
+    query: str,
+    candidates: list[RetrievedChunk],
+    k: int,
+) -> list[RetrievedChunk]:
+    """Score (query, chunk) pairs with the cross-encoder and return top-k.
+
+    Inference is CPU-bound, so it runs off the event loop. Scores are cached
+    per (query, chunk_id) for 15 minutes — repeated/reworded queries against
+    a stable corpus skip the model entirely.
+    """
+    if not candidates:
+        return []
+
+    now = time.monotonic()
+    scores: dict[int, float] = {}
+    to_score: list[int] = []
+    for i, chunk in enumerate(candidates):
+        cached = _score_cache.get((query, chunk.chunk_id))
+        if cached is not None and cached[0] > now:
+            scores[i] = cached[1]
+        else:
+            to_score.append(i)
+
+    if to_score:
+        model = _load_model()
+        pairs = [
+            (query, candidates[i].content[:_PAIR_CONTENT_CHARS]) for i in to_score
+        ]
+        predicted = await asyncio.to_thread(model.predict, pairs, batch_size=32)
+
+        if len(_score_cache) + len(to_score) > _SCORE_CACHE_MAX_ENTRIES:
+            for stale in [k for k, (exp, _) in _score_cache.items() if exp <= now]:
+                del _score_cache[stale]
+            if len(_score_cache) + len(to_score) > _SCORE_CACHE_MAX_ENTRIES:
+                _score_cache.clear()
+
+        expires_at = now + _SCORE_CACHE_TTL_SECONDS
+        for i, score in zip(to_score, predicted):
+            scores[i] = float(score)
+            _score_cache[(query, candidates[i].chunk_id)] = (expires_at, float(score))
+
+    ranked = sorted(range(len(candidates)), key=lambda i: scores[i], reverse=True)
+    logger.info(
+        "cross_encoder.rerank",
+        extra={
+            "candidates": len(candidates),
+            "cache_hits": len(candidates) - len(to_score),
+            "k": k,
+            "top_score": scores[ranked[0]],
+        },
+    )
+    return [candidates[i] for i in ranked[:k]]
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-import json
 import logging
 
+import orjson
+
 from pydantic import BaseModel
 
 from app.core.providers.base import BaseLLMProvider
@@ -59,7 +60,7 @@ async def extract(
             query,
             response_format={"type": "json_object"},
         )
-        data = json.loads(raw)
+        data = orjson.loads(raw)
         return QueryFilters.model_validate(data)
     except Exception as exc:
         logger.warning("filter_extractor: parse failed — %s", exc)
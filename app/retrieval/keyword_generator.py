@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-import json
 import logging
+from typing import Annotated
 
-from pydantic import BaseModel, Field
+import msgspec
 
 from app.core.providers.base import BaseLLMProvider
 from app.db.models import Tenant
@@ -11,8 +11,12 @@ from app.db.models import Tenant
 logger = logging.getLogger(__name__)
 
 
-class RankingKeywords(BaseModel):
-    keywords: list[str] = Field(min_length=1, max_length=10)
+class RankingKeywords(msgspec.Struct):
+    keywords: Annotated[list[str], msgspec.Meta(min_length=1, max_length=10)]
+
+
+# Single C-level parse+validate pass (vs json.loads + pydantic validation)
+_KEYWORDS_DECODER = msgspec.json.Decoder(RankingKeywords)
 
 
 async def generate(
@@ -61,9 +65,7 @@ async def generate(
             query,
             response_format={"type": "json_object"},
         )
-        data = json.loads(raw)
-        result = RankingKeywords.model_validate(data)
-        return result.keywords
+        return _KEYWORDS_DECODER.decode(raw).keywords
     except Exception as exc:
         logger.warning("keyword_generator: parse failed — %s", exc)
         # Naive fallback: use query tokens
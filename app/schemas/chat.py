@@ -23,6 +23,7 @@ class ChatRequest(BaseModel):
     query: str = Field(min_length=1, max_length=2000)
     agent_type: Literal["crag", "reflexion", "self_rag", "adaptive_rag"] = "crag"
     thread_id: str | None = None
+    stream: bool = False  # SSE token stream (crag only)
 
 
 class ChatResponse(BaseModel):
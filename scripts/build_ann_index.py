@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+"""build_ann_index.py — Build/tune the per-tenant ANN index after a bulk load.
+
+Usage:
+    python scripts/build_ann_index.py                      # EA schema
+    python scripts/build_ann_index.py tenant_acme_corp     # any tenant schema
+
+On pgvector >= 0.5 this (re)builds the HNSW index (fp16 halfvec cast on
+>= 0.7) — HNSW needs no training data, so this is only required if seeding
+skipped it or you want a CONCURRENTLY rebuild without blocking ingests.
+
+On older pgvector it builds the IVFFlat fallback, which trains centroids
+from the rows that actually exist: lists = max(10, sqrt(rowcount)), so run
+it AFTER the first bulk ingest, not on an empty table.
+
+CREATE INDEX CONCURRENTLY cannot run inside a transaction block, so each
+statement goes out as its own autocommit execute.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import asyncpg
+
+from app.config import settings
+from app.db._asyncpg_pool import get_pool
+
+try:  # optional: ~2x event-loop throughput for these I/O-bound scripts
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
+
+_DEFAULT_SCHEMA = "tenant_elastomers_au"
+_INDEX_NAME = "idx_chunks_embedding"
+
+
+async def build_index(conn: asyncpg.Connection, schema: str) -> None:
+    extversion: str = (
+        await conn.fetchval("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+        or "0"
+    )
+    version = tuple(int(p) for p in extversion.split(".")[:2] if p.isdigit())
+    row_count: int = await conn.fetchval(f"SELECT count(*) FROM {schema}.chunks")
+    print(f"pgvector {extversion}, {row_count:,} chunks in {schema!r}")
+
+    # Seed and admin-API paths name the index differently — match by suffix
+    # so we never stack a second ANN index on the same column
+    existing: str | None = await conn.fetchval(
+        """
+        SELECT indexname FROM pg_indexes
+        WHERE schemaname = $1 AND tablename = 'chunks'
+          AND indexname LIKE '%chunks_embedding'
+        """,
+        schema,
+    )
+    if existing:
+        print(f"ANN index {existing!r} already exists on {schema}.chunks — nothing to do.")
+        return
+
+    dims = settings.openai_embedding_dimensions
+    if version >= (0, 7):
+        index_sql = f"""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS {_INDEX_NAME}
+                ON {schema}.chunks
+                USING hnsw ((embedding::halfvec({dims})) halfvec_cosine_ops)
+                WITH (m = 16, ef_construction = 64)
+        """
+    elif version >= (0, 5):
+        index_sql = f"""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS {_INDEX_NAME}
+                ON {schema}.chunks
+                USING hnsw (embedding vector_cosine_ops)
+                WITH (m = 16, ef_construction = 64)
+        """
+    else:
+        if row_count == 0:
+            print("No chunks yet — IVFFlat needs rows to train centroids. Ingest first.")
+            return
+        # sqrt(rows) is pgvector's own sizing guidance; the old flat value
+        # of 100 is only near-optimal around 10k-100k rows
+        lists = max(10, int(row_count**0.5))
+        print(f"IVFFlat lists = {lists}")
+        index_sql = f"""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS {_INDEX_NAME}
+                ON {schema}.chunks
+                USING ivfflat (embedding vector_cosine_ops)
+                WITH (lists = {lists})
+        """
+
+    # More sort memory → dramatically faster index build; session-local only
+    await conn.execute("SET maintenance_work_mem = '1GB'")
+    print("Building index (CONCURRENTLY — ingests stay unblocked) …")
+    await conn.execute(index_sql)
+    print(f"✓ {_INDEX_NAME} ready on {schema}.chunks")
+
+
+async def main() -> None:
+    schema = sys.argv[1] if len(sys.argv) > 1 else _DEFAULT_SCHEMA
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        await build_index(conn, schema)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+"""e2e.py — Pipelined ingest + validation driver.
+
+Runs ingest_sample_docs and validate_queries as one overlapped flow:
+each validation query fires as soon as the document it needs reaches
+status=completed, instead of waiting for the whole ingest batch. The
+tail of ingest overlaps the head of validation, so end-to-end wall
+clock shrinks to roughly max(ingest) + the last dependent queries.
+
+Usage:
+    uvicorn app.main:app --port 8000 &
+    EA_API_KEY=... python scripts/e2e.py
+
+Uses API_BASE_URL for the ingest leg and API_BASE for the validation
+leg (same defaults as the standalone scripts) — point both at the same
+server if you override either.
+"""
+
+import asyncio
+import re
+import sys
+from pathlib import Path
+
+import httpx
+
+try:  # optional: ~2x event-loop throughput for these I/O-bound scripts
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import ingest_sample_docs as ingest
+import validate_queries as validate
+
+# Same doc-number shape the EA tenant config uses for filename parsing
+_DOC_NUMBER_RE = re.compile(r"^(EA-[A-Z-]+-\d+)")
+
+
+def _doc_number(name: str) -> str | None:
+    match = _DOC_NUMBER_RE.match(name)
+    return match.group(1) if match else None
+
+
+async def main() -> None:
+    if not ingest.API_KEY:
+        print("Error: EA_API_KEY environment variable is not set.")
+        sys.exit(1)
+
+    pdfs = sorted(ingest.SAMPLE_DOCS_DIR.glob("*.pdf"))
+    if not pdfs:
+        print(f"No PDFs found in {ingest.SAMPLE_DOCS_DIR}")
+        sys.exit(1)
+
+    # One completion event per document — queries await only the doc they
+    # cite, not the whole batch
+    doc_ready: dict[str, asyncio.Event] = {
+        dn: asyncio.Event() for pdf in pdfs if (dn := _doc_number(pdf.name))
+    }
+    ingest_ok: dict[str, str | None] = {}
+
+    semaphore = asyncio.Semaphore(ingest.CONCURRENCY)
+
+    async def ingest_one(pdf_path: Path) -> None:
+        name, doc_id = await ingest.ingest_file(ingest_client, pdf_path, semaphore)
+        ingest_ok[name] = doc_id
+        dn = _doc_number(name)
+        if dn:
+            # Set even on failure so dependent queries fail fast instead
+            # of hanging on an event that will never fire
+            doc_ready[dn].set()
+
+    async def validate_one(q: dict) -> tuple[dict, dict | None, Exception | None]:
+        requires = q["expected_source"].split()[0]
+        event = doc_ready.get(requires)
+        if event is not None:
+            await event.wait()
+        try:
+            return q, await validate.run_query(
+                query_client, q["query"], q.get("_hint_cf")
+            ), None
+        except Exception as exc:
+            return q, None, exc
+
+    all_queries = validate.QUERIES + validate.BONUS_QUERIES
+    print(f"Pipelining {len(pdfs)} ingests with {len(all_queries)} validation queries …\n")
+
+    limits = httpx.Limits(max_connections=len(pdfs) + 4)
+    async with (
+        httpx.AsyncClient(
+            http2=True, timeout=ingest.CLIENT_TIMEOUT, limits=limits
+        ) as ingest_client,
+        httpx.AsyncClient(http2=True, limits=httpx.Limits(max_connections=8)) as query_client,
+    ):
+        _, outcomes = await asyncio.gather(
+            asyncio.gather(*(ingest_one(pdf) for pdf in pdfs)),
+            asyncio.gather(*(validate_one(q) for q in all_queries)),
+        )
+
+    passed = failed = errors = 0
+    for q, result, exc in outcomes:
+        if exc is not None:
+            errors += 1
+            print(f"[{q['id']:>2}] 💥 ERROR: {exc}")
+            continue
+        ok = validate.check_result(result, q.get("_hint_cf"))
+        passed += ok
+        failed += not ok
+        print(f"[{q['id']:>2}] {'✅ PASS' if ok else '❌ FAIL'} — {q['query']}")
+
+    ingest_failed = [n for n, d in ingest_ok.items() if d is None]
+    print()
+    print("=" * 70)
+    print(f"  Ingest : {len(pdfs) - len(ingest_failed)}/{len(pdfs)} ok")
+    print(f"  Queries: {passed}/{len(all_queries)} passed | {failed} failed | {errors} errors")
+    print("=" * 70)
+
+    sys.exit(0 if not (failed or errors or ingest_failed) else 1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
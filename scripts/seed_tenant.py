@@ -13,7 +13,6 @@ Creates:
 """
 
 import asyncio
-import hashlib
 import secrets
 import sys
 from pathlib import Path
@@ -23,8 +22,14 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 import asyncpg
 
 from app.config import settings
+from app.core.security import hash_api_key
+from app.db._asyncpg_pool import get_pool
 
-_DB_URL = settings.database_url.replace("postgresql+asyncpg://", "postgresql://")
+try:  # optional: ~2x event-loop throughput for these I/O-bound scripts
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
 
 _TENANT_ID = "elastomers_au"
 _TENANT_NAME = "Elastomers Australia"
@@ -40,9 +45,11 @@ _TENANT_CONFIG = {
 async def create_tenant_schema(conn: asyncpg.Connection, schema: str) -> None:
     """Create per-tenant schema and all tables/indexes."""
     print(f"  Creating schema {schema!r} …")
-    await conn.execute(f"CREATE SCHEMA IF NOT EXISTS {schema};")
-
+    # Schema + tables go out as one multi-statement string — a single
+    # round-trip and parse pass via asyncpg's simple-query protocol
     await conn.execute(f"""
+        CREATE SCHEMA IF NOT EXISTS {schema};
+
         CREATE TABLE IF NOT EXISTS {schema}.documents (
             id              UUID PRIMARY KEY DEFAULT gen_random_uuid(),
             file_hash       TEXT NOT NULL UNIQUE,
@@ -58,9 +65,7 @@ async def create_tenant_schema(conn: asyncpg.Connection, schema: str) -> None:
             status          TEXT NOT NULL DEFAULT 'pending',
             created_at      TIMESTAMPTZ NOT NULL DEFAULT NOW()
         );
-    """)
 
-    await conn.execute(f"""
         CREATE TABLE IF NOT EXISTS {schema}.chunks (
             id              UUID PRIMARY KEY DEFAULT gen_random_uuid(),
             document_id     UUID NOT NULL REFERENCES {schema}.documents(id) ON DELETE CASCADE,
@@ -72,9 +77,7 @@ async def create_tenant_schema(conn: asyncpg.Connection, schema: str) -> None:
             token_count     INTEGER,
             created_at      TIMESTAMPTZ NOT NULL DEFAULT NOW()
         );
-    """)
 
-    await conn.execute(f"""
         CREATE TABLE IF NOT EXISTS {schema}.ingest_jobs (
             id              UUID PRIMARY KEY DEFAULT gen_random_uuid(),
             document_id     UUID,
@@ -85,20 +88,54 @@ async def create_tenant_schema(conn: asyncpg.Connection, schema: str) -> None:
         );
     """)
 
-    # pgvector ivfflat index — requires at least one row to build, so use IF NOT EXISTS
-    await conn.execute(f"""
-        CREATE INDEX IF NOT EXISTS idx_chunks_embedding
-            ON {schema}.chunks
-            USING ivfflat (embedding vector_cosine_ops)
-            WITH (lists = 100);
-    """)
+    # HNSW where pgvector >= 0.5 (no training step, better recall/latency);
+    # IVFFlat fallback for older extensions
+    extversion: str = (
+        await conn.fetchval("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+        or "0"
+    )
+    version = tuple(int(p) for p in extversion.split(".")[:2] if p.isdigit())
+    if version >= (0, 7):
+        # fp16 cast index — stored vectors stay float32, the graph scans
+        # half the bytes; queries must ORDER BY the same cast expression
+        embedding_index_sql = f"""
+            CREATE INDEX IF NOT EXISTS idx_chunks_embedding
+                ON {schema}.chunks
+                USING hnsw ((embedding::halfvec(1536)) halfvec_cosine_ops)
+                WITH (m = 16, ef_construction = 64);
+        """
+    elif version >= (0, 5):
+        embedding_index_sql = f"""
+            CREATE INDEX IF NOT EXISTS idx_chunks_embedding
+                ON {schema}.chunks
+                USING hnsw (embedding vector_cosine_ops)
+                WITH (m = 16, ef_construction = 64);
+        """
+    else:
+        # IVFFlat trains centroids from existing rows — building it on an
+        # empty table is pointless and lists can only be sized from a real
+        # row count. Defer to scripts/build_ann_index.py after first bulk load.
+        embedding_index_sql = ""
+        print(
+            "  ! pgvector < 0.5: no ANN index built — run "
+            "scripts/build_ann_index.py after the first ingest."
+        )
+
+    # All index DDL in one execute: generated tsvector + GIN index for
+    # in-database keyword ranking, ANN index, and the btree indexes
+    await conn.execute(embedding_index_sql + f"""
+        ALTER TABLE {schema}.chunks
+            ADD COLUMN IF NOT EXISTS content_tsv tsvector
+            GENERATED ALWAYS AS (
+                to_tsvector('english', coalesce(heading, '') || ' ' || content)
+            ) STORED;
+
+        CREATE INDEX IF NOT EXISTS idx_chunks_content_tsv
+            ON {schema}.chunks USING gin (content_tsv);
 
-    await conn.execute(f"""
         CREATE INDEX IF NOT EXISTS idx_chunks_document_id
             ON {schema}.chunks (document_id);
-    """)
 
-    await conn.execute(f"""
         CREATE INDEX IF NOT EXISTS idx_documents_doc_type
             ON {schema}.documents (doc_type);
     """)
@@ -108,11 +145,11 @@ async def create_tenant_schema(conn: asyncpg.Connection, schema: str) -> None:
 
 async def main() -> None:
     api_key = secrets.token_hex(32)
-    api_key_hash = hashlib.sha256(api_key.encode()).hexdigest()
+    api_key_hash = hash_api_key(api_key)
 
-    print(f"Connecting to database …")
-    conn = await asyncpg.connect(_DB_URL)
-    try:
+    print("Connecting to database …")
+    pool = await get_pool()
+    async with pool.acquire() as conn:
         # Check if tenant already exists
         existing = await conn.fetchval(
             "SELECT tenant_id FROM public.tenants WHERE tenant_id = $1", _TENANT_ID
@@ -159,9 +196,6 @@ async def main() -> None:
         else:
             print("(API key unchanged — use the key generated on first run)")
 
-    finally:
-        await conn.close()
-
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -20,12 +20,13 @@ from pathlib import Path
 # Allow running from project root without installing the package
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-import asyncpg
+from app.db._asyncpg_pool import get_pool
 
-from app.config import settings
-
-# Convert asyncpg URL to plain postgres URL for asyncpg.connect()
-_DB_URL = settings.database_url.replace("postgresql+asyncpg://", "postgresql://")
+try:  # optional: ~2x event-loop throughput for these I/O-bound scripts
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
 
 _CREATE_TENANTS_TABLE = """
 CREATE TABLE IF NOT EXISTS public.tenants (
@@ -62,22 +63,20 @@ ALTER TABLE public.tenant_usage
 
 
 async def main() -> None:
-    print(f"Connecting to {_DB_URL!r} …")
-    conn = await asyncpg.connect(_DB_URL)
-    try:
-        print("Enabling pgvector extension …")
-        await conn.execute("CREATE EXTENSION IF NOT EXISTS vector;")
-
-        print("Creating public.tenants table …")
-        await conn.execute(_CREATE_TENANTS_TABLE)
-
-        print("Creating/updating public.tenant_usage table …")
-        await conn.execute(_CREATE_TENANT_USAGE_TABLE)
-        await conn.execute(_MIGRATE_TENANT_USAGE_COLUMNS)
-
-        print("✓ Database setup complete.")
-    finally:
-        await conn.close()
+    print("Connecting to database …")
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        print("Creating extension + public tables …")
+        # One multi-statement execute — a single round-trip and parse pass
+        # (asyncpg's simple-query protocol accepts multi-statement strings)
+        await conn.execute(
+            "CREATE EXTENSION IF NOT EXISTS vector;\n"
+            + _CREATE_TENANTS_TABLE
+            + _CREATE_TENANT_USAGE_TABLE
+            + _MIGRATE_TENANT_USAGE_COLUMNS
+        )
+
+    print("✓ Database setup complete.")
 
 
 if __name__ == "__main__":
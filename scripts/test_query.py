@@ -11,34 +11,86 @@ Requires a running Postgres with ingested EA sample docs.
 """
 
 import asyncio
-import hashlib
+import functools
 import os
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from sqlalchemy import select
+if TYPE_CHECKING:
+    from app.db.models import Tenant
 
-from app.config import settings  # noqa: F401 — loads .env
-from app.core.providers.openai_provider import OpenAIProvider
-from app.db.models import Tenant
-from app.db.session import AsyncSessionLocal
-from app.retrieval import retriever
+try:  # optional: ~2x event-loop throughput for these I/O-bound scripts
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
 
+# App imports (SQLAlchemy, the OpenAI SDK, …) cost a few hundred ms of
+# cold start, so they happen inside the functions that need them — the
+# usage-error path below exits without paying for any of it.
 
-async def main(query: str) -> None:
-    api_key = os.environ.get("EA_API_KEY", "ea-dev-key-local-testing-only")
-    key_hash = hashlib.sha256(api_key.encode()).hexdigest()
 
-    async with AsyncSessionLocal() as session:
-        result = await session.execute(
-            select(Tenant).where(Tenant.api_key_hash == key_hash)
+@functools.lru_cache(maxsize=1)
+def _key_hash() -> str:
+    """Hash once per process — repeated main() calls in a REPL skip the work."""
+    from app.core.security import hash_api_key
+
+    return hash_api_key(os.environ.get("EA_API_KEY", "ea-dev-key-local-testing-only"))
+
+
+async def _lookup_tenant(key_hash: str) -> Tenant | None:
+    """Auth lookup via raw asyncpg — no ORM overhead for a one-row fetch.
+
+    The shared pool's statement cache keeps the query prepared server-side,
+    so repeat invocations in a REPL/loop skip Postgres parse+plan.
+    """
+    import orjson
+
+    from app.core import tenant_file_cache
+    from app.db._asyncpg_pool import get_pool
+    from app.db.models import Tenant
+
+    # Warm runs (ingest → validate → query chained in dev/CI) resolve the
+    # tenant from ~/.cache/ea-rag without touching the DB
+    cached = tenant_file_cache.get(key_hash)
+    if cached is not None:
+        return Tenant(**cached)
+
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        row = await conn.fetchrow(
+            """
+            SELECT tenant_id, name, schema_name, s3_prefix, config
+            FROM public.tenants
+            WHERE api_key_hash = $1 AND is_active
+            """,
+            key_hash,
         )
-        tenant = result.scalar_one_or_none()
+    if row is None:
+        return None
+    tenant_row = {
+        "tenant_id": row["tenant_id"],
+        "name": row["name"],
+        "schema_name": row["schema_name"],
+        "s3_prefix": row["s3_prefix"],
+        "config": orjson.loads(row["config"]) if row["config"] else {},
+    }
+    tenant_file_cache.put(key_hash, tenant_row)
+    return Tenant(**tenant_row)
+
+
+async def main(query: str) -> None:
+    from app.config import settings  # noqa: F401 — loads .env
+    from app.core.providers.openai_provider import OpenAIProvider
+    from app.retrieval import retriever
+
+    tenant = await _lookup_tenant(_key_hash())
 
     if tenant is None:
-        print(f"ERROR: No tenant found for API key. Run scripts/seed_tenant.py first.")
+        print("ERROR: No tenant found for API key. Run scripts/seed_tenant.py first.")
         sys.exit(1)
 
     print(f"Tenant : {tenant.name} ({tenant.tenant_id})")
@@ -69,5 +121,6 @@ if __name__ == "__main__":
         print("Usage: python scripts/test_query.py <query>")
         sys.exit(1)
 
-    query_arg = " ".join(sys.argv[1:])
+    # Single-arg invocations (the common case) skip the list + join
+    query_arg = sys.argv[1] if len(sys.argv) == 2 else " ".join(sys.argv[1:])
     asyncio.run(main(query_arg))
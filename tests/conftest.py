@@ -1,6 +1,123 @@
 from __future__ import annotations
 
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
 import pytest
+import pytest_asyncio
+from httpx import ASGITransport
+
+from app.agent.crag_agent import _GRAPH_CACHE, _NODE_CACHE
+from app.agent.nodes import _generation_cache
+from app.core.security import invalidate_tenant_cache
+from app.main import app
+
+_MISSING = object()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _warm_app() -> None:
+    """Pay FastAPI's lazy startup costs once per worker, up front.
+
+    Forces the OpenAPI schema build and the route dependency graphs so the
+    first test (on every xdist worker) doesn't absorb the cold-start cost.
+    """
+    app.openapi()
+    for route in app.routes:
+        getattr(route, "dependant", None)
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """Run every async test on uvloop when available (pytest-asyncio hook).
+
+    The suite's API tests each push dozens of awaits through the Starlette
+    stack; libuv's C dispatcher shaves the per-callback scheduling cost.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        import asyncio
+
+        return asyncio.DefaultEventLoopPolicy()
+    return uvloop.EventLoopPolicy()
+
+
+@pytest.fixture(autouse=True)
+def _clear_agent_caches() -> None:
+    """Keep process-wide agent caches from leaking across tests."""
+    _generation_cache.clear()
+    _NODE_CACHE.clear()
+    _GRAPH_CACHE.clear()
+    invalidate_tenant_cache()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def api_client():
+    """One ASGI test client shared across the whole session.
+
+    ASGITransport has no connection pool — each request invokes the app
+    directly — so a single client is safe across tests and skips the
+    per-test client/transport setup and teardown.
+    """
+    async with httpx.AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://test",
+        # ASGITransport keeps no real sockets, but pinning keepalive and a
+        # short timeout keeps pool bookkeeping cheap and fails hung tests
+        # in seconds instead of stalling the worker
+        limits=httpx.Limits(max_keepalive_connections=64, keepalive_expiry=60),
+        timeout=httpx.Timeout(5.0),
+    ) as client:
+        yield client
+
+
+@pytest.fixture
+def mock_session_factory():
+    """Factory for the AsyncSession mock the API tests rebuild everywhere.
+
+    Returns a MagicMock session that works as an async context manager,
+    with commit/delete/get/refresh/add pre-wired and an execute() result
+    shaped by the keyword arguments. AsyncMock construction is one of the
+    heaviest operations in unittest.mock, so building only the methods a
+    session actually needs (instead of a full AsyncMock per test step)
+    keeps the suite snappy as the API tests multiply.
+    """
+
+    def _make(
+        *,
+        scalars_all: list | None = None,
+        scalar_one_or_none: object = _MISSING,
+        get: object | None = None,
+        refresh: object | None = None,
+    ) -> MagicMock:
+        session = MagicMock()
+        session.__aenter__ = AsyncMock(return_value=session)
+        session.__aexit__ = AsyncMock(return_value=False)
+        session.add = MagicMock()
+        session.commit = AsyncMock()
+        session.delete = AsyncMock()
+        session.get = AsyncMock(return_value=get)
+
+        # Plain coroutine — refresh is never call-asserted, and skipping
+        # AsyncMock's call bookkeeping is ~3-5x cheaper per await
+        async def _refresh(obj: object) -> None:
+            if refresh is not None:
+                refresh(obj)
+
+        session.refresh = _refresh
+        result = MagicMock()
+        if scalars_all is not None:
+            result.scalars.return_value.all.return_value = scalars_all
+        if scalar_one_or_none is not _MISSING:
+            result.scalar_one_or_none.return_value = scalar_one_or_none
+        session.execute = AsyncMock(return_value=result)
+        # What tenant_session() returns: a sessionmaker yielding this session
+        session.maker = MagicMock(return_value=session)
+        return session
+
+    return _make
+
 
 # TODO: add fixtures in Task 2+
 # Planned fixtures:
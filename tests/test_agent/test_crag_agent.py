@@ -8,12 +8,11 @@ import pytest
 
 from app.agent.crag_agent import create_crag_graph, run_crag
 from app.agent.nodes import (
-    GradeDecision,
+    GradeAndRewrite,
     make_generate_node,
     make_grade_node,
     make_retrieve_node,
-    make_rewrite_node,
-    should_rewrite,
+    should_web_search,
 )
 from app.agent.state import AgentState
 from app.schemas.chat import Source
@@ -57,16 +56,16 @@ def _make_chunk(
         page_number=page,
         heading="Installation Procedure",
         content=content,
-        similarity_score=0.12,
+        similarity_score=0.45,
     )
 
 
 # ---------------------------------------------------------------------------
-# Unit tests — should_rewrite router
+# Unit tests — should_web_search router
 # ---------------------------------------------------------------------------
 
 
-def test_should_rewrite_relevant() -> None:
+def test_should_web_search_relevant() -> None:
     state: AgentState = {
         "query": "q",
         "rewritten_query": "",
@@ -76,10 +75,10 @@ def test_should_rewrite_relevant() -> None:
         "answer": "",
         "sources": [],
     }
-    assert should_rewrite(state) == "generate"
+    assert should_web_search(state) == "generate"
 
 
-def test_should_rewrite_irrelevant() -> None:
+def test_should_web_search_irrelevant() -> None:
     state: AgentState = {
         "query": "q",
         "rewritten_query": "",
@@ -89,7 +88,7 @@ def test_should_rewrite_irrelevant() -> None:
         "answer": "",
         "sources": [],
     }
-    assert should_rewrite(state) == "rewrite"
+    assert should_web_search(state) == "web_search"
 
 
 # ---------------------------------------------------------------------------
@@ -100,7 +99,16 @@ def test_should_rewrite_irrelevant() -> None:
 async def test_grade_node_relevant() -> None:
     provider = _make_provider()
     provider.generate = AsyncMock(
-        return_value=(json.dumps({"is_relevant": True, "reasoning": "Documents answer the question."}), None)
+        return_value=(
+            json.dumps(
+                {
+                    "is_relevant": True,
+                    "reasoning": "Documents answer the question.",
+                    "rewritten_query": "should be ignored",
+                }
+            ),
+            None,
+        )
     )
     grade_node = make_grade_node(provider)
     state: AgentState = {
@@ -114,12 +122,22 @@ async def test_grade_node_relevant() -> None:
     }
     result = await grade_node(state)
     assert result["is_relevant"] is True
+    assert result["rewritten_query"] == ""
 
 
 async def test_grade_node_irrelevant() -> None:
     provider = _make_provider()
     provider.generate = AsyncMock(
-        return_value=(json.dumps({"is_relevant": False, "reasoning": "Documents are unrelated."}), None)
+        return_value=(
+            json.dumps(
+                {
+                    "is_relevant": False,
+                    "reasoning": "Documents are unrelated.",
+                    "rewritten_query": "rubber price per tonne mining screen media",
+                }
+            ),
+            None,
+        )
     )
     grade_node = make_grade_node(provider)
     state: AgentState = {
@@ -133,6 +151,7 @@ async def test_grade_node_irrelevant() -> None:
     }
     result = await grade_node(state)
     assert result["is_relevant"] is False
+    assert result["rewritten_query"] == "rubber price per tonne mining screen media"
 
 
 async def test_grade_node_no_docs_returns_irrelevant() -> None:
@@ -152,61 +171,42 @@ async def test_grade_node_no_docs_returns_irrelevant() -> None:
     provider.generate.assert_not_called()
 
 
-async def test_grade_node_parse_error_fails_open() -> None:
-    """On invalid JSON / parse error, grade should fail-open (is_relevant=True)."""
+async def test_grade_node_short_circuits_on_confident_retrieval() -> None:
+    """Top relevance >= grade_skip_threshold should skip the LLM grade."""
     provider = _make_provider()
-    provider.generate = AsyncMock(return_value=("this is not json", None))
     grade_node = make_grade_node(provider)
+    chunk = _make_chunk()
+    chunk.similarity_score = 0.05  # relevance 0.95 > default threshold 0.85
     state: AgentState = {
-        "query": "any query",
+        "query": "What is the installation torque?",
         "rewritten_query": "",
-        "retrieved_docs": [_make_chunk()],
+        "retrieved_docs": [chunk],
         "web_results": "",
         "is_relevant": False,
         "answer": "",
         "sources": [],
     }
     result = await grade_node(state)
-    assert result["is_relevant"] is True  # fail-open
-
-
-# ---------------------------------------------------------------------------
-# Unit tests — rewrite_node
-# ---------------------------------------------------------------------------
-
-
-async def test_rewrite_node_updates_rewritten_query() -> None:
-    provider = _make_provider()
-    provider.generate = AsyncMock(return_value=("rubber compound formulation EA screen panels", None))
-    rewrite_node = make_rewrite_node(provider)
-    state: AgentState = {
-        "query": "What rubber is used?",
-        "rewritten_query": "",
-        "retrieved_docs": [],
-        "web_results": "",
-        "is_relevant": False,
-        "answer": "",
-        "sources": [],
-    }
-    result = await rewrite_node(state)
-    assert result["rewritten_query"] == "rubber compound formulation EA screen panels"
+    assert result["is_relevant"] is True
+    provider.generate.assert_not_called()
 
 
-async def test_rewrite_node_strips_quotes() -> None:
+async def test_grade_node_parse_error_fails_open() -> None:
+    """On invalid JSON / parse error, grade should fail-open (is_relevant=True)."""
     provider = _make_provider()
-    provider.generate = AsyncMock(return_value=('"quoted rewritten query"', None))
-    rewrite_node = make_rewrite_node(provider)
+    provider.generate = AsyncMock(return_value=("this is not json", None))
+    grade_node = make_grade_node(provider)
     state: AgentState = {
-        "query": "original",
+        "query": "any query",
         "rewritten_query": "",
-        "retrieved_docs": [],
+        "retrieved_docs": [_make_chunk()],
         "web_results": "",
         "is_relevant": False,
         "answer": "",
         "sources": [],
     }
-    result = await rewrite_node(state)
-    assert result["rewritten_query"] == "quoted rewritten query"
+    result = await grade_node(state)
+    assert result["is_relevant"] is True  # fail-open
 
 
 # ---------------------------------------------------------------------------
@@ -283,7 +283,7 @@ async def test_generate_node_no_context() -> None:
 
 
 async def test_crag_graph_relevant_path() -> None:
-    """When grade returns relevant, the graph should NOT call rewrite or web_search."""
+    """When grade returns relevant, the graph should NOT call web_search."""
     tenant = _make_tenant()
     provider = _make_provider()
     chunk = _make_chunk()
@@ -298,10 +298,6 @@ async def test_crag_graph_relevant_path() -> None:
         call_log.append("grade")
         return {"is_relevant": True}
 
-    async def mock_rewrite(state: AgentState) -> dict:
-        call_log.append("rewrite")
-        return {"rewritten_query": "rewritten"}
-
     async def mock_web_search(state: AgentState) -> dict:
         call_log.append("web_search")
         return {"web_results": "some web content"}
@@ -313,7 +309,6 @@ async def test_crag_graph_relevant_path() -> None:
     with (
         patch("app.agent.crag_agent.make_retrieve_node", return_value=mock_retrieve),
         patch("app.agent.crag_agent.make_grade_node", return_value=mock_grade),
-        patch("app.agent.crag_agent.make_rewrite_node", return_value=mock_rewrite),
         patch("app.agent.crag_agent.make_web_search_node", return_value=mock_web_search),
         patch("app.agent.crag_agent.make_generate_node", return_value=mock_generate),
     ):
@@ -331,14 +326,13 @@ async def test_crag_graph_relevant_path() -> None:
 
     assert "retrieve" in call_log
     assert "grade" in call_log
-    assert "rewrite" not in call_log, "rewrite should not be called on relevant path"
     assert "web_search" not in call_log, "web_search should not be called on relevant path"
     assert "generate" in call_log
     assert final_state["answer"] == "Final answer."
 
 
 async def test_crag_graph_irrelevant_path() -> None:
-    """When grade returns irrelevant, the graph MUST call rewrite and web_search."""
+    """When grade returns irrelevant, the graph MUST call web_search."""
     tenant = _make_tenant()
     provider = _make_provider()
 
@@ -352,10 +346,6 @@ async def test_crag_graph_irrelevant_path() -> None:
         call_log.append("grade")
         return {"is_relevant": False}
 
-    async def mock_rewrite(state: AgentState) -> dict:
-        call_log.append("rewrite")
-        return {"rewritten_query": "better query"}
-
     async def mock_web_search(state: AgentState) -> dict:
         call_log.append("web_search")
         return {"web_results": "[1] Web result content"}
@@ -367,7 +357,6 @@ async def test_crag_graph_irrelevant_path() -> None:
     with (
         patch("app.agent.crag_agent.make_retrieve_node", return_value=mock_retrieve),
         patch("app.agent.crag_agent.make_grade_node", return_value=mock_grade),
-        patch("app.agent.crag_agent.make_rewrite_node", return_value=mock_rewrite),
         patch("app.agent.crag_agent.make_web_search_node", return_value=mock_web_search),
         patch("app.agent.crag_agent.make_generate_node", return_value=mock_generate),
     ):
@@ -383,7 +372,7 @@ async def test_crag_graph_irrelevant_path() -> None:
         }
         final_state = await graph.ainvoke(initial)
 
-    assert call_log == ["retrieve", "grade", "rewrite", "web_search", "generate"]
+    assert call_log == ["retrieve", "grade", "web_search", "generate"]
     assert final_state["answer"] == "Answer from web."
 
 
@@ -406,16 +395,12 @@ async def test_run_crag_returns_answer_and_sources() -> None:
             ],
         }
 
-    async def mock_rewrite(state: AgentState) -> dict:
-        return {"rewritten_query": ""}
-
     async def mock_web_search(state: AgentState) -> dict:
         return {"web_results": ""}
 
     with (
         patch("app.agent.crag_agent.make_retrieve_node", return_value=mock_retrieve),
         patch("app.agent.crag_agent.make_grade_node", return_value=mock_grade),
-        patch("app.agent.crag_agent.make_rewrite_node", return_value=mock_rewrite),
         patch("app.agent.crag_agent.make_web_search_node", return_value=mock_web_search),
         patch("app.agent.crag_agent.make_generate_node", return_value=mock_generate),
     ):
@@ -424,3 +409,39 @@ async def test_run_crag_returns_answer_and_sources() -> None:
     assert answer == "Torque is 45 Nm."
     assert len(sources) == 1
     assert sources[0].doc_number == "EA-SOP-001"
+
+
+async def test_generate_never_hits_cached_grade_semantically() -> None:
+    """Grade and generate semantic namespaces must stay disjoint.
+
+    Their user messages for the same query+chunk are near-duplicates, so a
+    shared namespace would let the generate lookup return a cached grader
+    verdict as the user-facing answer.
+    """
+    tenant = _make_tenant()
+    chunk = _make_chunk()
+    state: AgentState = {
+        "query": "What torque is required?",
+        "rewritten_query": "",
+        "retrieved_docs": [chunk],
+        "web_results": "",
+        "is_relevant": True,
+        "answer": "",
+        "sources": [],
+    }
+
+    # Grade first, through the real cached path — the mocked embed returns
+    # the same vector for every message, so the verdict would semantically
+    # match the generate lookup if the namespaces were shared
+    grade_provider = _make_provider()
+    grade_json = json.dumps({"is_relevant": True, "reasoning": "", "rewritten_query": ""})
+    grade_provider.generate = AsyncMock(return_value=(grade_json, None))
+    grade_node = make_grade_node(grade_provider, tenant)
+    await grade_node(state)
+
+    provider = _make_provider()
+    provider.generate = AsyncMock(return_value=("Proper prose answer. [1]", None))
+    generate_node = make_generate_node(tenant, provider)
+    result = await generate_node(state)
+    assert result["answer"] == "Proper prose answer. [1]"
+    provider.generate.assert_awaited_once()
@@ -4,9 +4,7 @@ import uuid
 from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
-import httpx
 import pytest
-from httpx import ASGITransport
 
 from app.config import settings
 from app.dependencies import get_admin, get_db
@@ -43,7 +41,10 @@ def _make_db_session(scalar_one_or_none=None, scalars_all=None, get_result=None)
     session.get = AsyncMock(return_value=get_result)
     session.add = MagicMock()
     session.commit = AsyncMock()
-    session.refresh = AsyncMock(side_effect=lambda obj: None)
+    async def _refresh(obj) -> None:  # plain coroutine — never call-asserted
+        pass
+
+    session.refresh = _refresh
     session.__aenter__ = AsyncMock(return_value=session)
     session.__aexit__ = AsyncMock(return_value=False)
     return session
@@ -55,34 +56,35 @@ def _mock_db(session):
     return _get_db
 
 
-async def test_create_tenant_wrong_admin_key() -> None:
+async def test_create_tenant_wrong_admin_key(api_client) -> None:
     """Request with wrong X-Admin-Key returns 403."""
-    async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-        response = await client.post(
-            "/api/v1/admin/tenants",
-            headers={"X-Admin-Key": "definitely-wrong-key"},
-            json={"tenant_id": "acme", "name": "ACME Corp"},
-        )
+    response = await api_client.post(
+        "/api/v1/admin/tenants",
+        headers={"X-Admin-Key": "definitely-wrong-key"},
+        json={"tenant_id": "acme", "name": "ACME Corp"},
+    )
     assert response.status_code == 403
 
 
-async def test_create_tenant() -> None:
+async def test_create_tenant(api_client) -> None:
     session = _make_db_session(scalar_one_or_none=None)
     tenant_row = _make_tenant_row(tenant_id="acme", name="ACME Corp", schema_name="tenant_acme")
     # After session.refresh, the tenant object should have the right data
-    session.refresh = AsyncMock(side_effect=lambda obj: setattr(obj, "id", tenant_row.id) or
-                                setattr(obj, "created_at", tenant_row.created_at))
+    async def _refresh(obj) -> None:
+        obj.id = tenant_row.id
+        obj.created_at = tenant_row.created_at
+
+    session.refresh = _refresh
 
     app.dependency_overrides[get_admin] = _mock_no_admin()
     app.dependency_overrides[get_db] = _mock_db(session)
     with patch("app.api.v1.admin.create_tenant_schema", new=AsyncMock()):
         try:
-            async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-                response = await client.post(
-                    "/api/v1/admin/tenants",
-                    headers={"X-Admin-Key": settings.admin_api_key or "test-admin"},
-                    json={"tenant_id": "acme", "name": "ACME Corp", "config": {}},
-                )
+            response = await api_client.post(
+                "/api/v1/admin/tenants",
+                headers={"X-Admin-Key": settings.admin_api_key or "test-admin"},
+                json={"tenant_id": "acme", "name": "ACME Corp", "config": {}},
+            )
         finally:
             app.dependency_overrides.clear()
 
@@ -94,26 +96,25 @@ async def test_create_tenant() -> None:
     assert len(body["api_key"]) == 64  # secrets.token_hex(32) = 64 hex chars
 
 
-async def test_create_tenant_duplicate() -> None:
+async def test_create_tenant_duplicate(api_client) -> None:
     existing = _make_tenant_row(tenant_id="acme")
     session = _make_db_session(scalar_one_or_none=existing)
 
     app.dependency_overrides[get_admin] = _mock_no_admin()
     app.dependency_overrides[get_db] = _mock_db(session)
     try:
-        async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-            response = await client.post(
-                "/api/v1/admin/tenants",
-                headers={"X-Admin-Key": settings.admin_api_key or "test-admin"},
-                json={"tenant_id": "acme", "name": "ACME Corp"},
-            )
+        response = await api_client.post(
+            "/api/v1/admin/tenants",
+            headers={"X-Admin-Key": settings.admin_api_key or "test-admin"},
+            json={"tenant_id": "acme", "name": "ACME Corp"},
+        )
     finally:
         app.dependency_overrides.clear()
 
     assert response.status_code == 409
 
 
-async def test_list_tenants() -> None:
+async def test_list_tenants(api_client) -> None:
     tenants = [
         _make_tenant_row(tenant_id="acme"),
         _make_tenant_row(tenant_id="beta"),
@@ -123,11 +124,10 @@ async def test_list_tenants() -> None:
     app.dependency_overrides[get_admin] = _mock_no_admin()
     app.dependency_overrides[get_db] = _mock_db(session)
     try:
-        async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-            response = await client.get(
-                "/api/v1/admin/tenants",
-                headers={"X-Admin-Key": settings.admin_api_key or "test-admin"},
-            )
+        response = await api_client.get(
+            "/api/v1/admin/tenants",
+            headers={"X-Admin-Key": settings.admin_api_key or "test-admin"},
+        )
     finally:
         app.dependency_overrides.clear()
 
@@ -138,7 +138,7 @@ async def test_list_tenants() -> None:
     assert body[1]["tenant_id"] == "beta"
 
 
-async def test_patch_tenant() -> None:
+async def test_patch_tenant(api_client) -> None:
     tenant_id = uuid.uuid4()
     existing = _make_tenant_row(
         id=tenant_id,
@@ -152,12 +152,11 @@ async def test_patch_tenant() -> None:
     app.dependency_overrides[get_admin] = _mock_no_admin()
     app.dependency_overrides[get_db] = _mock_db(session)
     try:
-        async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-            response = await client.patch(
-                f"/api/v1/admin/tenants/{tenant_id}",
-                headers={"X-Admin-Key": settings.admin_api_key or "test-admin"},
-                json={"config": {"new_key": "new_value"}, "is_active": False},
-            )
+        response = await api_client.patch(
+            f"/api/v1/admin/tenants/{tenant_id}",
+            headers={"X-Admin-Key": settings.admin_api_key or "test-admin"},
+            json={"config": {"new_key": "new_value"}, "is_active": False},
+        )
     finally:
         app.dependency_overrides.clear()
 
@@ -167,19 +166,50 @@ async def test_patch_tenant() -> None:
     assert existing.is_active is False
 
 
-async def test_patch_tenant_not_found() -> None:
+async def test_patch_tenant_invalidates_agent_caches(api_client) -> None:
+    """Config changes must evict the agent's cached node/graph closures."""
+    from app.agent.crag_agent import _GRAPH_CACHE, _NODE_CACHE
+
+    tenant_id = uuid.uuid4()
+    other_id = uuid.uuid4()
+    _NODE_CACHE[(tenant_id, "OpenAIProvider")] = ("stale",)
+    _GRAPH_CACHE[(tenant_id, "OpenAIProvider")] = object()
+    _NODE_CACHE[(other_id, "OpenAIProvider")] = ("kept",)
+
+    existing = _make_tenant_row(id=tenant_id, tenant_id="acme", is_active=True)
+    session = _make_db_session(get_result=existing)
+    session.refresh = AsyncMock(return_value=None)
+
+    app.dependency_overrides[get_admin] = _mock_no_admin()
+    app.dependency_overrides[get_db] = _mock_db(session)
+    try:
+        response = await api_client.patch(
+            f"/api/v1/admin/tenants/{tenant_id}",
+            headers={"X-Admin-Key": settings.admin_api_key or "test-admin"},
+            json={"config": {"restricted_doc_types": ["ENG-MAT", "STRAT"]}},
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert (tenant_id, "OpenAIProvider") not in _NODE_CACHE
+    assert (tenant_id, "OpenAIProvider") not in _GRAPH_CACHE
+    # Other tenants' entries survive
+    assert (other_id, "OpenAIProvider") in _NODE_CACHE
+
+
+async def test_patch_tenant_not_found(api_client) -> None:
     missing_id = uuid.uuid4()
     session = _make_db_session(get_result=None)
 
     app.dependency_overrides[get_admin] = _mock_no_admin()
     app.dependency_overrides[get_db] = _mock_db(session)
     try:
-        async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-            response = await client.patch(
-                f"/api/v1/admin/tenants/{missing_id}",
-                headers={"X-Admin-Key": settings.admin_api_key or "test-admin"},
-                json={"is_active": False},
-            )
+        response = await api_client.patch(
+            f"/api/v1/admin/tenants/{missing_id}",
+            headers={"X-Admin-Key": settings.admin_api_key or "test-admin"},
+            json={"is_active": False},
+        )
     finally:
         app.dependency_overrides.clear()
 
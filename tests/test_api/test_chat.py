@@ -2,10 +2,8 @@ from __future__ import annotations
 
 from unittest.mock import AsyncMock, MagicMock, patch
 
-import httpx
 import pytest
 from fastapi import HTTPException
-from httpx import ASGITransport
 
 from app.dependencies import get_provider, get_tenant
 from app.main import app
@@ -37,7 +35,7 @@ def _mock_provider(provider: MagicMock):
     return _get_provider
 
 
-async def test_chat_returns_answer() -> None:
+async def test_chat_returns_answer(api_client) -> None:
     tenant = _make_tenant()
     provider = _make_provider()
     sources = [Source(doc_number="EA-SOP-001", title="Guide", page_number=3, s3_key="ea/sop.pdf")]
@@ -46,11 +44,10 @@ async def test_chat_returns_answer() -> None:
         app.dependency_overrides[get_tenant] = _mock_tenant(tenant)
         app.dependency_overrides[get_provider] = _mock_provider(provider)
         try:
-            async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-                response = await client.post(
-                    "/api/v1/chat",
-                    json={"query": "What torque for M20 bolts?"},
-                )
+            response = await api_client.post(
+                "/api/v1/chat",
+                json={"query": "What torque for M20 bolts?"},
+            )
         finally:
             app.dependency_overrides.clear()
 
@@ -62,47 +59,78 @@ async def test_chat_returns_answer() -> None:
     assert body["sources"][0]["doc_number"] == "EA-SOP-001"
 
 
-async def test_chat_empty_query() -> None:
+async def test_chat_empty_query(api_client) -> None:
     tenant = _make_tenant()
     provider = _make_provider()
     app.dependency_overrides[get_tenant] = _mock_tenant(tenant)
     app.dependency_overrides[get_provider] = _mock_provider(provider)
     try:
-        async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-            response = await client.post("/api/v1/chat", json={"query": ""})
+        response = await api_client.post("/api/v1/chat", json={"query": ""})
     finally:
         app.dependency_overrides.clear()
 
     assert response.status_code == 422
 
 
-async def test_chat_query_too_long() -> None:
+async def test_chat_query_too_long(api_client) -> None:
     tenant = _make_tenant()
     provider = _make_provider()
     app.dependency_overrides[get_tenant] = _mock_tenant(tenant)
     app.dependency_overrides[get_provider] = _mock_provider(provider)
     try:
-        async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-            response = await client.post("/api/v1/chat", json={"query": "x" * 2001})
+        response = await api_client.post("/api/v1/chat", json={"query": "x" * 2001})
     finally:
         app.dependency_overrides.clear()
 
     assert response.status_code == 422
 
 
-async def test_chat_invalid_api_key() -> None:
+async def test_chat_invalid_api_key(api_client) -> None:
     async def _bad_tenant():
         raise HTTPException(status_code=401, detail="Invalid or inactive API key")
 
     app.dependency_overrides[get_tenant] = _bad_tenant
     try:
-        async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-            response = await client.post(
-                "/api/v1/chat",
-                headers={"X-API-Key": "bad-key"},
-                json={"query": "test"},
-            )
+        response = await api_client.post(
+            "/api/v1/chat",
+            headers={"X-API-Key": "bad-key"},
+            json={"query": "test"},
+        )
     finally:
         app.dependency_overrides.clear()
 
     assert response.status_code == 401
+
+
+async def test_chat_stream_returns_sse_events(api_client) -> None:
+    tenant = _make_tenant()
+    provider = _make_provider()
+    sources = [Source(doc_number="EA-SOP-001", title="Guide", page_number=3, s3_key="ea/sop.pdf")]
+
+    async def fake_run_crag(query, tenant, provider, answer_queue=None):
+        await answer_queue.put("The torque ")
+        await answer_queue.put("is 370 Nm.")
+        await answer_queue.put(None)
+        return ("The torque is 370 Nm.", sources, None)
+
+    with (
+        patch("app.api.v1.chat.run_crag", new=fake_run_crag),
+        patch("app.api.v1.chat.check_token_budget", new=AsyncMock()),
+    ):
+        app.dependency_overrides[get_tenant] = _mock_tenant(tenant)
+        app.dependency_overrides[get_provider] = _mock_provider(provider)
+        try:
+            response = await api_client.post(
+                "/api/v1/chat",
+                json={"query": "What torque for M20 bolts?", "stream": True},
+            )
+        finally:
+            app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [line for line in response.text.split("\n\n") if line.startswith("data: ")]
+    assert events[0] == 'data: {"delta": "The torque "}'
+    assert events[1] == 'data: {"delta": "is 370 Nm."}'
+    assert '"sources"' in events[2] and '"EA-SOP-001"' in events[2]
+    assert events[-1] == "data: [DONE]"
@@ -2,172 +2,163 @@ from __future__ import annotations
 
 import uuid
 from datetime import datetime, timezone
-from unittest.mock import AsyncMock, MagicMock, patch
+from types import SimpleNamespace
 
-import httpx
 import pytest
 from fastapi import HTTPException
-from httpx import ASGITransport
 
-from app.dependencies import get_tenant
+from app.dependencies import get_tenant, get_tenant_session_maker
 from app.main import app
 
 
-def _make_tenant() -> MagicMock:
-    tenant = MagicMock()
-    tenant.tenant_id = "test_tenant"
-    tenant.name = "Test Tenant"
-    tenant.schema_name = "tenant_test"
-    tenant.config = {}
-    return tenant
+def _make_tenant() -> SimpleNamespace:
+    # Plain attribute carrier — SimpleNamespace skips MagicMock's child-mock
+    # and magic-method machinery these objects never use
+    return SimpleNamespace(
+        tenant_id="test_tenant",
+        name="Test Tenant",
+        schema_name="tenant_test",
+        config={},
+    )
 
 
-def _mock_tenant(tenant: MagicMock):
+def _mock_tenant(tenant: SimpleNamespace):
     async def _get_tenant():
         return tenant
     return _get_tenant
 
 
-def _make_doc(doc_type: str = "SOP") -> MagicMock:
-    doc = MagicMock()
-    doc.id = uuid.uuid4()
-    doc.filename = f"EA-{doc_type}-001-Guide.pdf"
-    doc.doc_number = f"EA-{doc_type}-001"
-    doc.doc_type = doc_type
-    doc.revision = "A"
-    doc.title = "Installation Guide"
-    doc.classification = "STANDARD"
-    doc.page_count = 12
-    doc.status = "completed"
-    doc.created_at = datetime(2024, 1, 15, tzinfo=timezone.utc)
-    return doc
+def _make_doc(doc_type: str = "SOP") -> SimpleNamespace:
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        filename=f"EA-{doc_type}-001-Guide.pdf",
+        doc_number=f"EA-{doc_type}-001",
+        doc_type=doc_type,
+        revision="A",
+        title="Installation Guide",
+        classification="STANDARD",
+        page_count=12,
+        status="completed",
+        created_at=datetime(2024, 1, 15, tzinfo=timezone.utc),
+    )
+
+
+@pytest.mark.parametrize(
+    ("doc_types", "params", "expected_types"),
+    [
+        ([], None, []),                                  # empty tenant
+        (["SOP", "ENG-DRW"], None, ["SOP", "ENG-DRW"]),  # unfiltered listing
+        (["SOP"], {"doc_type": "SOP"}, ["SOP"]),         # doc_type query param
+    ],
+)
+async def test_list_documents(
+    api_client,
+    mock_session_factory,
+    doc_types: list[str],
+    params: dict | None,
+    expected_types: list[str],
+) -> None:
+    tenant = _make_tenant()
+    docs = [_make_doc(t) for t in doc_types]
 
+    mock_session = mock_session_factory(scalars_all=docs)
+    result = mock_session.execute.return_value
 
-async def test_list_documents_empty() -> None:
-    tenant = _make_tenant()
+    # Capture the compiled SQL so a silently dropped WHERE clause fails the
+    # test — the response alone would still match on these mocks. A plain
+    # coroutine is also far cheaper than AsyncMock's call bookkeeping.
+    captured_sql: list[str] = []
 
-    mock_session = AsyncMock()
-    mock_result = MagicMock()
-    mock_result.scalars.return_value.all.return_value = []
-    mock_session.execute = AsyncMock(return_value=mock_result)
-    mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-    mock_session.__aexit__ = AsyncMock(return_value=False)
+    async def _exec(stmt, *args, **kwargs):
+        captured_sql.append(str(stmt.compile(compile_kwargs={"literal_binds": True})))
+        return result
 
-    mock_maker = MagicMock(return_value=mock_session)
+    mock_session.execute = _exec
 
     app.dependency_overrides[get_tenant] = _mock_tenant(tenant)
-    with patch("app.api.v1.documents.tenant_session", return_value=mock_maker):
-        try:
-            async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-                response = await client.get("/api/v1/documents")
-        finally:
-            app.dependency_overrides.clear()
+    app.dependency_overrides[get_tenant_session_maker] = lambda: mock_session.maker
+    try:
+        response = await api_client.get("/api/v1/documents", params=params)
+    finally:
+        app.dependency_overrides.clear()
 
     assert response.status_code == 200
-    assert response.json() == []
+    body = response.json()
+    assert [d["doc_type"] for d in body] == expected_types
 
+    if params and "doc_type" in params:
+        assert f"doc_type = '{params['doc_type']}'" in captured_sql[0]
+    else:
+        assert "WHERE" not in captured_sql[0]
 
-async def test_list_documents_with_results() -> None:
-    tenant = _make_tenant()
-    docs = [_make_doc("SOP"), _make_doc("ENG-DRW")]
 
-    mock_session = AsyncMock()
-    mock_result = MagicMock()
-    mock_result.scalars.return_value.all.return_value = docs
-    mock_session.execute = AsyncMock(return_value=mock_result)
-    mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-    mock_session.__aexit__ = AsyncMock(return_value=False)
+async def test_delete_document(api_client, mock_session_factory) -> None:
+    """DELETE returns 204; S3 deletion skipped in development mode."""
+    tenant = _make_tenant()
+    doc = _make_doc()
+    doc.s3_key = "tenants/test/doc.pdf"
 
-    mock_maker = MagicMock(return_value=mock_session)
+    mock_session = mock_session_factory(get=doc)
+    mock_maker = mock_session.maker
 
     app.dependency_overrides[get_tenant] = _mock_tenant(tenant)
-    with patch("app.api.v1.documents.tenant_session", return_value=mock_maker):
-        try:
-            async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-                response = await client.get("/api/v1/documents")
-        finally:
-            app.dependency_overrides.clear()
+    app.dependency_overrides[get_tenant_session_maker] = lambda: mock_maker
+    try:
+        response = await api_client.delete(f"/api/v1/documents/{doc.id}")
+    finally:
+        app.dependency_overrides.clear()
 
-    assert response.status_code == 200
-    body = response.json()
-    assert len(body) == 2
-    assert body[0]["doc_type"] == "SOP"
-    assert body[1]["doc_type"] == "ENG-DRW"
+    assert response.status_code == 204
+    mock_session.delete.assert_called_once_with(doc)
+    mock_session.commit.assert_called_once()
 
 
-async def test_list_documents_doc_type_filter() -> None:
-    """doc_type query param should be passed through to the SQL filter."""
+async def test_delete_document_not_found(api_client, mock_session_factory) -> None:
     tenant = _make_tenant()
-    docs = [_make_doc("SOP")]
-
-    mock_session = AsyncMock()
-    mock_result = MagicMock()
-    mock_result.scalars.return_value.all.return_value = docs
-    mock_session.execute = AsyncMock(return_value=mock_result)
-    mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-    mock_session.__aexit__ = AsyncMock(return_value=False)
+    missing_id = uuid.uuid4()
 
-    mock_maker = MagicMock(return_value=mock_session)
+    mock_session = mock_session_factory(get=None)
+    mock_maker = mock_session.maker
 
     app.dependency_overrides[get_tenant] = _mock_tenant(tenant)
-    with patch("app.api.v1.documents.tenant_session", return_value=mock_maker):
-        try:
-            async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-                response = await client.get("/api/v1/documents", params={"doc_type": "SOP"})
-        finally:
-            app.dependency_overrides.clear()
+    app.dependency_overrides[get_tenant_session_maker] = lambda: mock_maker
+    try:
+        response = await api_client.delete(f"/api/v1/documents/{missing_id}")
+    finally:
+        app.dependency_overrides.clear()
 
-    assert response.status_code == 200
-    body = response.json()
-    assert len(body) == 1
-    assert body[0]["doc_type"] == "SOP"
+    assert response.status_code == 404
 
 
-async def test_delete_document() -> None:
-    """DELETE returns 204; S3 deletion skipped in development mode."""
+async def test_get_document_by_hash_found(api_client, mock_session_factory) -> None:
     tenant = _make_tenant()
     doc = _make_doc()
-    doc.s3_key = "tenants/test/doc.pdf"
-
-    mock_session = AsyncMock()
-    mock_session.get = AsyncMock(return_value=doc)
-    mock_session.delete = AsyncMock()
-    mock_session.commit = AsyncMock()
-    mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-    mock_session.__aexit__ = AsyncMock(return_value=False)
 
-    mock_maker = MagicMock(return_value=mock_session)
+    mock_session = mock_session_factory(scalar_one_or_none=doc)
+    mock_maker = mock_session.maker
 
     app.dependency_overrides[get_tenant] = _mock_tenant(tenant)
-    with patch("app.api.v1.documents.tenant_session", return_value=mock_maker):
-        try:
-            async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-                response = await client.delete(f"/api/v1/documents/{doc.id}")
-        finally:
-            app.dependency_overrides.clear()
+    app.dependency_overrides[get_tenant_session_maker] = lambda: mock_maker
+    try:
+        response = await api_client.get("/api/v1/documents/by-hash/" + "ab" * 32)
+    finally:
+        app.dependency_overrides.clear()
 
-    assert response.status_code == 204
-    mock_session.delete.assert_called_once_with(doc)
-    mock_session.commit.assert_called_once()
+    assert response.status_code == 200
+    assert response.json()["id"] == str(doc.id)
 
 
-async def test_delete_document_not_found() -> None:
+async def test_get_document_by_hash_not_found(api_client, mock_session_factory) -> None:
     tenant = _make_tenant()
-    missing_id = uuid.uuid4()
-
-    mock_session = AsyncMock()
-    mock_session.get = AsyncMock(return_value=None)
-    mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-    mock_session.__aexit__ = AsyncMock(return_value=False)
 
-    mock_maker = MagicMock(return_value=mock_session)
+    mock_session = mock_session_factory(scalar_one_or_none=None)
+    mock_maker = mock_session.maker
 
     app.dependency_overrides[get_tenant] = _mock_tenant(tenant)
-    with patch("app.api.v1.documents.tenant_session", return_value=mock_maker):
-        try:
-            async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-                response = await client.delete(f"/api/v1/documents/{missing_id}")
-        finally:
-            app.dependency_overrides.clear()
+    app.dependency_overrides[get_tenant_session_maker] = lambda: mock_maker
+    try:
+        response = await api_client.get("/api/v1/documents/by-hash/" + "cd" * 32)
+    finally:
+        app.dependency_overrides.clear()
 
     assert response.status_code == 404
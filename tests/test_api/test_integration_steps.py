@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+"""The former ingest→poll→chat→list→delete lifecycle test, one step per test.
+
+Each step carries only its own patch setup, so pytest-xdist can run them
+concurrently and a failure points at the exact step. Coverage matches the
+old monolithic flow in test_integration.py.
+"""
+
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.dependencies import get_provider, get_tenant, get_tenant_session_maker
+from app.main import app
+from app.schemas.chat import Source
+
+_DOC_ID = uuid.uuid4()
+_JOB_ID = uuid.uuid4()
+
+
+@pytest.fixture
+def tenant() -> SimpleNamespace:
+    return SimpleNamespace(
+        tenant_id="integration_tenant",
+        name="Integration Test Tenant",
+        schema_name="tenant_integration",
+        s3_prefix="tenants/integration/",
+        config={},
+    )
+
+
+@pytest.fixture
+def doc() -> SimpleNamespace:
+    return SimpleNamespace(
+        id=_DOC_ID,
+        filename="EA-SOP-001-Screen-Installation.pdf",
+        doc_number="EA-SOP-001",
+        doc_type="SOP",
+        revision="A",
+        title="Screen Installation",
+        classification="STANDARD",
+        page_count=10,
+        status="completed",
+        created_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        s3_key="tenants/integration/EA-SOP-001.pdf",
+    )
+
+
+@pytest.fixture
+def ingest_job() -> SimpleNamespace:
+    return SimpleNamespace(
+        id=_JOB_ID,
+        status="completed",
+        document_id=_DOC_ID,
+        error=None,
+        created_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        updated_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+    )
+
+
+@pytest.fixture
+def _overrides(tenant: SimpleNamespace):
+    app.dependency_overrides[get_tenant] = lambda: tenant
+    app.dependency_overrides[get_provider] = lambda: MagicMock()
+    yield
+    app.dependency_overrides.clear()
+
+
+async def test_step_upload(api_client, mock_session_factory, _overrides) -> None:
+    mock_session = mock_session_factory(
+        refresh=lambda obj: setattr(obj, "id", _JOB_ID)
+    )
+    app.dependency_overrides[get_tenant_session_maker] = lambda: mock_session.maker
+    with patch.multiple(
+        "app.api.v1.ingest",
+        compute_hash=MagicMock(return_value="abc123"),
+        find_existing=AsyncMock(return_value=None),
+        run_pipeline=MagicMock(),
+    ):
+        response = await api_client.post(
+            "/api/v1/ingest",
+            files={
+                "file": (
+                    "EA-SOP-001-Screen-Installation.pdf",
+                    b"%PDF-1.4 test",
+                    "application/pdf",
+                )
+            },
+        )
+
+    assert response.status_code == 202, response.text
+    assert response.json()["status"] == "pending"
+
+
+async def test_step_poll(api_client, mock_session_factory, ingest_job, _overrides) -> None:
+    mock_session = mock_session_factory(get=ingest_job)
+    app.dependency_overrides[get_tenant_session_maker] = lambda: mock_session.maker
+    response = await api_client.get(f"/api/v1/ingest/{_JOB_ID}")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "completed"
+    assert body["document_id"] == str(_DOC_ID)
+
+
+async def test_step_chat(api_client, _overrides) -> None:
+    sources = [
+        Source(
+            doc_number="EA-SOP-001",
+            title="Screen Installation",
+            page_number=5,
+            s3_key="ea/sop.pdf",
+        )
+    ]
+    with patch(
+        "app.api.v1.chat.run_crag",
+        new=AsyncMock(return_value=("The torque is 370 Nm.", sources, None)),
+    ):
+        response = await api_client.post(
+            "/api/v1/chat",
+            json={"query": "What torque for M20 Grade 10.9 bolts lubricated?"},
+        )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert "370" in body["answer"]
+    assert len(body["sources"]) == 1
+
+
+async def test_step_list(api_client, mock_session_factory, doc, _overrides) -> None:
+    mock_session = mock_session_factory(scalars_all=[doc])
+    app.dependency_overrides[get_tenant_session_maker] = lambda: mock_session.maker
+    response = await api_client.get("/api/v1/documents")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body) == 1
+    assert body[0]["doc_number"] == "EA-SOP-001"
+
+
+async def test_step_delete(api_client, mock_session_factory, doc, _overrides) -> None:
+    mock_session = mock_session_factory(get=doc)
+    app.dependency_overrides[get_tenant_session_maker] = lambda: mock_session.maker
+    response = await api_client.delete(f"/api/v1/documents/{_DOC_ID}")
+
+    assert response.status_code == 204
+    mock_session.delete.assert_called_once_with(doc)
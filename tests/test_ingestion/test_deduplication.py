@@ -8,22 +8,33 @@ import pytest
 from app.ingestion.hash_check import compute_hash, find_existing
 
 
-def test_compute_hash_deterministic() -> None:
-    data = b"hello world"
-    assert compute_hash(data) == compute_hash(data)
+@pytest.fixture(scope="session")
+def hash_cache():
+    """Memoize compute_hash per input so the parametrized cases share work."""
+    cache: dict[bytes, str] = {}
 
+    def _hash(data: bytes) -> str:
+        if data not in cache:
+            cache[data] = compute_hash(data)
+        return cache[data]
 
-def test_compute_hash_differs_for_different_content() -> None:
-    assert compute_hash(b"file A content") != compute_hash(b"file B content")
+    return _hash
 
 
-def test_compute_hash_is_sha256_hex() -> None:
-    result = compute_hash(b"test")
-    assert len(result) == 64
-    assert all(c in "0123456789abcdef" for c in result)
+@pytest.mark.parametrize(
+    "data", [b"hello world", b"test", b"file A content", b"file B content"]
+)
+def test_compute_hash_deterministic_sha256_hex(data: bytes, hash_cache) -> None:
+    digest = hash_cache(data)
+    assert digest == compute_hash(data)  # deterministic across calls
+    # fromhex validates hex and parses in one C call; 32 bytes == sha256
+    assert len(bytes.fromhex(digest)) == 32
+
+
+def test_compute_hash_differs_for_different_content(hash_cache) -> None:
+    assert hash_cache(b"file A content") != hash_cache(b"file B content")
 
 
-@pytest.mark.asyncio
 async def test_new_hash_returns_none() -> None:
     session = MagicMock()
     execute_result = MagicMock()
@@ -34,7 +45,6 @@ async def test_new_hash_returns_none() -> None:
     assert result is None
 
 
-@pytest.mark.asyncio
 async def test_existing_hash_returns_document_id() -> None:
     existing_id = uuid.uuid4()
     session = MagicMock()
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import uuid
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.retrieval import cross_encoder
+from app.schemas.retrieval import RetrievedChunk
+
+
+def _make_chunk(content: str) -> RetrievedChunk:
+    return RetrievedChunk(
+        chunk_id=uuid.uuid4(),
+        document_id=uuid.uuid4(),
+        doc_number="EA-SOP-001",
+        doc_type="SOP",
+        title="Screen Installation Guide",
+        classification="STANDARD",
+        s3_key="ea/EA-SOP-001.pdf",
+        page_number=1,
+        heading=None,
+        content=content,
+        similarity_score=0.2,
+    )
+
+
+@pytest.fixture(autouse=True)
+def _clear_score_cache() -> None:
+    cross_encoder._score_cache.clear()
+
+
+def test_disabled_without_reranker_model() -> None:
+    # settings.reranker_model defaults to "" → feature off, BM25 path retained
+    assert cross_encoder.enabled() is False
+
+
+async def test_rerank_orders_by_model_score() -> None:
+    chunks = [_make_chunk("alpha"), _make_chunk("beta"), _make_chunk("gamma")]
+    model = MagicMock()
+    model.predict.return_value = [0.1, 0.9, 0.5]
+
+    with patch.object(cross_encoder, "_load_model", return_value=model):
+        ranked = await cross_encoder.rerank("query", chunks, k=2)
+
+    assert [c.content for c in ranked] == ["beta", "gamma"]
+
+
+async def test_rerank_caches_scores_per_chunk() -> None:
+    chunks = [_make_chunk("alpha"), _make_chunk("beta")]
+    model = MagicMock()
+    model.predict.return_value = [0.3, 0.7]
+
+    with patch.object(cross_encoder, "_load_model", return_value=model):
+        await cross_encoder.rerank("query", chunks, k=2)
+        await cross_encoder.rerank("query", chunks, k=2)
+
+    model.predict.assert_called_once()
+
+
+async def test_rerank_empty_candidates() -> None:
+    assert await cross_encoder.rerank("query", [], k=5) == []
+
+
+async def test_score_cache_stays_bounded() -> None:
+    """Distinct queries must not grow the score cache without limit."""
+    import time
+
+    # Fill to the cap with live entries plus a few expired stragglers
+    far_future = time.monotonic() + 1000
+    for i in range(cross_encoder._SCORE_CACHE_MAX_ENTRIES - 1):
+        cross_encoder._score_cache[(f"q{i}", uuid.uuid4())] = (far_future, 0.5)
+    expired_key = ("expired", uuid.uuid4())
+    cross_encoder._score_cache[expired_key] = (time.monotonic() - 1, 0.5)
+
+    chunks = [_make_chunk("alpha"), _make_chunk("beta")]
+    model = MagicMock()
+    model.predict.return_value = [0.3, 0.7]
+    with patch.object(cross_encoder, "_load_model", return_value=model):
+        await cross_encoder.rerank("fresh query", chunks, k=2)
+
+    assert len(cross_encoder._score_cache) <= cross_encoder._SCORE_CACHE_MAX_ENTRIES
+    assert expired_key not in cross_encoder._score_cache
+    # the fresh scores made it in
+    assert ("fresh query", chunks[0].chunk_id) in cross_encoder._score_cache
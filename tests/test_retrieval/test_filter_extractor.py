@@ -3,7 +3,6 @@ from __future__ import annotations
 import json
 from unittest.mock import AsyncMock, MagicMock
 
-import pytest
 
 from app.retrieval.filter_extractor import QueryFilters, extract
 
@@ -20,7 +19,6 @@ def _make_provider(json_response: dict) -> MagicMock:
     return provider
 
 
-@pytest.mark.asyncio
 async def test_extract_doc_type() -> None:
     provider = _make_provider({"doc_type": "SOP", "doc_number": None, "classification": None})
     result = await extract("screen installation SOP", _make_tenant(), provider)
@@ -29,7 +27,6 @@ async def test_extract_doc_type() -> None:
     assert result.classification is None
 
 
-@pytest.mark.asyncio
 async def test_extract_doc_number() -> None:
     provider = _make_provider({"doc_type": "ENG-DRW", "doc_number": "EA-ENG-DRW-7834", "classification": None})
     result = await extract("EA-ENG-DRW-7834 banana screen", _make_tenant(), provider)
@@ -37,21 +34,18 @@ async def test_extract_doc_number() -> None:
     assert result.doc_number == "EA-ENG-DRW-7834"
 
 
-@pytest.mark.asyncio
 async def test_extract_classification() -> None:
     provider = _make_provider({"doc_type": None, "doc_number": None, "classification": "CONFIDENTIAL"})
     result = await extract("show confidential docs", _make_tenant(), provider)
     assert result.classification == "CONFIDENTIAL"
 
 
-@pytest.mark.asyncio
 async def test_extract_all_none() -> None:
     provider = _make_provider({"doc_type": None, "doc_number": None, "classification": None})
     result = await extract("what is the bolt torque?", _make_tenant(), provider)
     assert result == QueryFilters()
 
 
-@pytest.mark.asyncio
 async def test_extract_returns_empty_on_parse_error() -> None:
     provider = MagicMock()
     provider.generate = AsyncMock(return_value=("not valid json{{{", None))
@@ -59,7 +53,6 @@ async def test_extract_returns_empty_on_parse_error() -> None:
     assert result == QueryFilters()
 
 
-@pytest.mark.asyncio
 async def test_extract_returns_empty_on_llm_error() -> None:
     provider = MagicMock()
     provider.generate = AsyncMock(side_effect=RuntimeError("LLM unavailable"))
@@ -67,7 +60,6 @@ async def test_extract_returns_empty_on_llm_error() -> None:
     assert result == QueryFilters()
 
 
-@pytest.mark.asyncio
 async def test_extract_uses_tenant_valid_doc_types() -> None:
     """Provider is called with a system prompt that includes tenant's valid_doc_types."""
     provider = _make_provider({"doc_type": "CUSTOM", "doc_number": None, "classification": None})
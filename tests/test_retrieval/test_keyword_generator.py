@@ -3,7 +3,6 @@ from __future__ import annotations
 import json
 from unittest.mock import AsyncMock, MagicMock
 
-import pytest
 
 from app.retrieval.keyword_generator import generate
 
@@ -21,7 +20,6 @@ def _make_provider(json_response: dict) -> MagicMock:
     return provider
 
 
-@pytest.mark.asyncio
 async def test_generate_returns_five_keywords() -> None:
     keywords = ["installation procedure", "installation steps", "screen panel", "tensioning", "assembly"]
     provider = _make_provider({"keywords": keywords})
@@ -30,7 +28,6 @@ async def test_generate_returns_five_keywords() -> None:
     assert len(result) == 5
 
 
-@pytest.mark.asyncio
 async def test_generate_fallback_on_parse_error() -> None:
     provider = MagicMock()
     provider.generate = AsyncMock(return_value=("invalid json{{", None))
@@ -39,7 +36,6 @@ async def test_generate_fallback_on_parse_error() -> None:
     assert result == ["bolt", "torque", "procedure"]
 
 
-@pytest.mark.asyncio
 async def test_generate_fallback_on_llm_error() -> None:
     provider = MagicMock()
     provider.generate = AsyncMock(side_effect=RuntimeError("LLM error"))
@@ -47,7 +43,6 @@ async def test_generate_fallback_on_llm_error() -> None:
     assert result == ["screen", "panel", "dimensions"]
 
 
-@pytest.mark.asyncio
 async def test_generate_fallback_truncates_to_five_tokens() -> None:
     provider = MagicMock()
     provider.generate = AsyncMock(side_effect=RuntimeError("LLM error"))
@@ -55,7 +50,6 @@ async def test_generate_fallback_truncates_to_five_tokens() -> None:
     assert len(result) <= 5
 
 
-@pytest.mark.asyncio
 async def test_generate_uses_tenant_domain_in_prompt() -> None:
     keywords = ["k1", "k2", "k3", "k4", "k5"]
     provider = _make_provider({"keywords": keywords})
@@ -65,7 +59,6 @@ async def test_generate_uses_tenant_domain_in_prompt() -> None:
     assert "mining screen media" in call_args[0][0]  # system_prompt
 
 
-@pytest.mark.asyncio
 async def test_generate_uses_domain_hints_in_prompt() -> None:
     keywords = ["k1", "k2", "k3", "k4", "k5"]
     provider = _make_provider({"keywords": keywords})
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+
+from app.retrieval.query_analyzer import analyze
+
+
+def _make_tenant(config: dict | None = None) -> MagicMock:
+    tenant = MagicMock()
+    tenant.name = "Test Tenant"
+    tenant.tenant_id = "test_tenant"
+    tenant.config = config or {}
+    return tenant
+
+
+def _make_provider(json_response: dict) -> MagicMock:
+    provider = MagicMock()
+    provider.generate = AsyncMock(return_value=(json.dumps(json_response), None))
+    return provider
+
+
+async def test_analyze_returns_filters_and_keywords() -> None:
+    provider = _make_provider(
+        {
+            "filters": {"doc_type": "SOP", "doc_number": None, "classification": None},
+            "keywords": ["installation procedure", "screen panel", "tensioning", "assembly", "torque"],
+        }
+    )
+    result = await analyze("screen installation SOP", _make_tenant(), provider)
+    assert result.filters.doc_type == "SOP"
+    assert result.filters.doc_number is None
+    assert len(result.keywords) == 5
+    provider.generate.assert_awaited_once()
+
+
+async def test_analyze_doc_number() -> None:
+    provider = _make_provider(
+        {
+            "filters": {"doc_type": "ENG-DRW", "doc_number": "EA-ENG-DRW-7834", "classification": None},
+            "keywords": ["banana screen"],
+        }
+    )
+    result = await analyze("EA-ENG-DRW-7834 banana screen", _make_tenant(), provider)
+    assert result.filters.doc_number == "EA-ENG-DRW-7834"
+
+
+async def test_analyze_falls_back_to_query_tokens_on_parse_error() -> None:
+    provider = MagicMock()
+    provider.generate = AsyncMock(return_value=("not valid json{{{", None))
+    result = await analyze("what is the bolt torque spec", _make_tenant(), provider)
+    assert result.filters.doc_type is None
+    assert result.keywords == ["what", "is", "the", "bolt", "torque"]
@@ -3,9 +3,9 @@ from __future__ import annotations
 import uuid
 from unittest.mock import AsyncMock, MagicMock, patch
 
-import pytest
-
+from app.config import settings
 from app.retrieval.filter_extractor import QueryFilters
+from app.retrieval.query_analyzer import QueryAnalysis
 from app.retrieval.retriever import retrieve
 from app.schemas.retrieval import RetrievedChunk
 
@@ -40,15 +40,18 @@ def _chunk(content: str = "test content") -> RetrievedChunk:
     )
 
 
-@pytest.mark.asyncio
 async def test_retrieve_returns_ranked_chunks() -> None:
     chunks = [_chunk(f"chunk {i}") for i in range(3)]
     provider = _make_provider()
 
     with (
-        patch("app.retrieval.retriever.filter_extractor.extract", new=AsyncMock(return_value=QueryFilters())),
-        patch("app.retrieval.retriever.keyword_generator.generate", new=AsyncMock(return_value=["screen", "installation"])),
+        patch(
+            "app.retrieval.retriever.query_analyzer.analyze",
+            new=AsyncMock(return_value=QueryAnalysis(keywords=["screen", "installation"])),
+        ),
         patch("app.retrieval.retriever.vector_store.search", new=AsyncMock(return_value=chunks)),
+        patch("app.retrieval.retriever.vector_store.has_content_tsv", new=AsyncMock(return_value=False)),
+        patch("app.retrieval.retriever.vector_store.fetch_contents", new=AsyncMock(return_value={})),
         patch("app.retrieval.retriever.bm25_ranker.rank", return_value=chunks[:2]) as mock_rank,
         patch("app.retrieval.retriever.tenant_session") as mock_ts,
     ):
@@ -63,14 +66,16 @@ async def test_retrieve_returns_ranked_chunks() -> None:
     mock_rank.assert_called_once()
 
 
-@pytest.mark.asyncio
 async def test_retrieve_calls_embed_once() -> None:
     provider = _make_provider()
 
     with (
-        patch("app.retrieval.retriever.filter_extractor.extract", new=AsyncMock(return_value=QueryFilters())),
-        patch("app.retrieval.retriever.keyword_generator.generate", new=AsyncMock(return_value=["kw1"])),
+        patch(
+            "app.retrieval.retriever.query_analyzer.analyze",
+            new=AsyncMock(return_value=QueryAnalysis(keywords=["kw1"])),
+        ),
         patch("app.retrieval.retriever.vector_store.search", new=AsyncMock(return_value=[])),
+        patch("app.retrieval.retriever.vector_store.has_content_tsv", new=AsyncMock(return_value=False)),
         patch("app.retrieval.retriever.bm25_ranker.rank", return_value=[]),
         patch("app.retrieval.retriever.tenant_session") as mock_ts,
     ):
@@ -84,14 +89,16 @@ async def test_retrieve_calls_embed_once() -> None:
     provider.embed.assert_awaited_once_with("any query")
 
 
-@pytest.mark.asyncio
 async def test_retrieve_returns_empty_on_no_candidates() -> None:
     provider = _make_provider()
 
     with (
-        patch("app.retrieval.retriever.filter_extractor.extract", new=AsyncMock(return_value=QueryFilters())),
-        patch("app.retrieval.retriever.keyword_generator.generate", new=AsyncMock(return_value=[])),
+        patch(
+            "app.retrieval.retriever.query_analyzer.analyze",
+            new=AsyncMock(return_value=QueryAnalysis()),
+        ),
         patch("app.retrieval.retriever.vector_store.search", new=AsyncMock(return_value=[])),
+        patch("app.retrieval.retriever.vector_store.has_content_tsv", new=AsyncMock(return_value=False)),
         patch("app.retrieval.retriever.bm25_ranker.rank", return_value=[]),
         patch("app.retrieval.retriever.tenant_session") as mock_ts,
     ):
@@ -105,15 +112,17 @@ async def test_retrieve_returns_empty_on_no_candidates() -> None:
     assert result == []
 
 
-@pytest.mark.asyncio
 async def test_retrieve_passes_filters_to_vector_store() -> None:
     filters = QueryFilters(doc_type="SOP")
     provider = _make_provider()
 
     with (
-        patch("app.retrieval.retriever.filter_extractor.extract", new=AsyncMock(return_value=filters)),
-        patch("app.retrieval.retriever.keyword_generator.generate", new=AsyncMock(return_value=["kw"])),
+        patch(
+            "app.retrieval.retriever.query_analyzer.analyze",
+            new=AsyncMock(return_value=QueryAnalysis(filters=filters, keywords=["kw"])),
+        ),
         patch("app.retrieval.retriever.vector_store.search", new=AsyncMock(return_value=[])) as mock_vs,
+        patch("app.retrieval.retriever.vector_store.has_content_tsv", new=AsyncMock(return_value=False)),
         patch("app.retrieval.retriever.bm25_ranker.rank", return_value=[]),
         patch("app.retrieval.retriever.tenant_session") as mock_ts,
     ):
@@ -126,3 +135,97 @@ async def test_retrieve_passes_filters_to_vector_store() -> None:
 
     call_kwargs = mock_vs.call_args.kwargs
     assert call_kwargs["filters"].doc_type == "SOP"
+
+
+async def test_retrieve_hydrates_full_content_for_survivors() -> None:
+    chunk = _chunk("preview only")
+    provider = _make_provider()
+
+    with (
+        patch(
+            "app.retrieval.retriever.query_analyzer.analyze",
+            new=AsyncMock(return_value=QueryAnalysis(keywords=["kw"])),
+        ),
+        patch("app.retrieval.retriever.vector_store.search", new=AsyncMock(return_value=[chunk])),
+        patch("app.retrieval.retriever.vector_store.has_content_tsv", new=AsyncMock(return_value=False)),
+        patch(
+            "app.retrieval.retriever.vector_store.fetch_contents",
+            new=AsyncMock(return_value={chunk.chunk_id: "the full untruncated content"}),
+        ),
+        patch("app.retrieval.retriever.bm25_ranker.rank", return_value=[chunk]),
+        patch("app.retrieval.retriever.tenant_session") as mock_ts,
+    ):
+        mock_session = AsyncMock()
+        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
+        mock_session.__aexit__ = AsyncMock(return_value=False)
+        mock_ts.return_value = MagicMock(return_value=mock_session)
+
+        result = await retrieve("any query", _make_tenant(), provider, k=1)
+
+    assert result[0].content == "the full untruncated content"
+
+
+async def test_retrieve_uses_hybrid_sql_ranking_when_tsv_available() -> None:
+    """With content_tsv present, ranking happens in SQL — no BM25 call."""
+    chunk = _chunk("hybrid ranked")
+    provider = _make_provider()
+
+    with (
+        patch(
+            "app.retrieval.retriever.query_analyzer.analyze",
+            new=AsyncMock(return_value=QueryAnalysis(keywords=["kw"])),
+        ),
+        patch("app.retrieval.retriever.vector_store.search", new=AsyncMock(return_value=[chunk])) as mock_vs,
+        patch("app.retrieval.retriever.vector_store.has_content_tsv", new=AsyncMock(return_value=True)),
+        patch("app.retrieval.retriever.vector_store.fetch_contents", new=AsyncMock(return_value={})),
+        patch("app.retrieval.retriever.bm25_ranker.rank") as mock_rank,
+        patch("app.retrieval.retriever.tenant_session") as mock_ts,
+    ):
+        mock_session = AsyncMock()
+        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
+        mock_session.__aexit__ = AsyncMock(return_value=False)
+        mock_ts.return_value = MagicMock(return_value=mock_session)
+
+        result = await retrieve("screen installation", _make_tenant(), provider, k=1)
+
+    assert result == [chunk]
+    mock_rank.assert_not_called()
+    assert mock_vs.call_args.kwargs["keywords"] == ["kw"]
+    # The ANN inner query gets the oversample; SQL truncates back to k
+    assert mock_vs.call_args.kwargs["fetch_k"] == settings.retrieval_fetch_multiplier
+    assert mock_vs.call_args.kwargs["k"] == 1
+
+
+async def test_retrieve_short_circuits_on_exact_doc_number() -> None:
+    """An exact doc_number filter fetches that doc's chunks directly."""
+    chunk = _chunk("page one content")
+    provider = _make_provider()
+    filters = QueryFilters(doc_number="EA-SOP-001")
+
+    with (
+        patch(
+            "app.retrieval.retriever.query_analyzer.analyze",
+            new=AsyncMock(return_value=QueryAnalysis(filters=filters, keywords=["kw"])),
+        ),
+        patch(
+            "app.retrieval.retriever.vector_store.fetch_by_doc_number",
+            new=AsyncMock(return_value=[chunk]),
+        ) as mock_direct,
+        patch("app.retrieval.retriever.vector_store.search", new=AsyncMock()) as mock_vs,
+        patch(
+            "app.retrieval.retriever.bm25_ranker.rank", return_value=[chunk]
+        ) as mock_rank,
+        patch("app.retrieval.retriever.tenant_session") as mock_ts,
+    ):
+        mock_session = AsyncMock()
+        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
+        mock_session.__aexit__ = AsyncMock(return_value=False)
+        mock_ts.return_value = MagicMock(return_value=mock_session)
+
+        result = await retrieve("show me EA-SOP-001", _make_tenant(), provider, k=5)
+
+    assert result == [chunk]
+    mock_direct.assert_awaited_once()
+    mock_vs.assert_not_called()
+    # Intra-doc ordering still follows the query keywords, not page order
+    mock_rank.assert_called_once_with([chunk], ["kw"], 5)
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from types import SimpleNamespace
+
+from app.core.security import _tenant_cache, hash_api_key, invalidate_tenant_cache
+
+
+def _cache_entry(api_key_hash: str) -> tuple[float, SimpleNamespace]:
+    tenant = SimpleNamespace(tenant_id="t", api_key_hash=api_key_hash)
+    return (time.monotonic() + 60.0, tenant)
+
+
+def test_invalidate_by_stored_hash() -> None:
+    key_hash = hash_api_key("some-api-key")
+    _tenant_cache[key_hash] = _cache_entry(key_hash)
+
+    invalidate_tenant_cache(key_hash)
+    assert key_hash not in _tenant_cache
+
+
+def test_invalidate_legacy_tenant_cached_under_blake2b() -> None:
+    """Legacy rows store SHA-256 but are cached under the BLAKE2b digest.
+
+    Invalidation is called with the stored hash, so it must also match on
+    the cached row's api_key_hash — otherwise a deactivated legacy tenant
+    stays authorized for the full cache TTL.
+    """
+    key = "legacy-api-key"
+    stored_sha256 = hashlib.sha256(key.encode()).hexdigest()
+    runtime_key = hash_api_key(key)  # BLAKE2b — what verify_api_key caches under
+    _tenant_cache[runtime_key] = _cache_entry(stored_sha256)
+
+    invalidate_tenant_cache(stored_sha256)
+    assert runtime_key not in _tenant_cache
+
+
+def test_invalidate_none_clears_everything() -> None:
+    _tenant_cache["a"] = _cache_entry("a")
+    _tenant_cache["b"] = _cache_entry("b")
+
+    invalidate_tenant_cache()
+    assert not _tenant_cache
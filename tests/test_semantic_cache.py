@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from app.core.semantic_cache import SemanticCache
+
+
+def _vec(*values: float, dims: int = 8) -> list[float]:
+    vec = list(values)
+    return vec + [0.0] * (dims - len(vec))
+
+
+def test_exact_hit_roundtrip() -> None:
+    cache = SemanticCache()
+    key = SemanticCache.exact_key("tenant_a", "system", "user question")
+    assert cache.get_exact(key) is None
+    cache.put("tenant_a", key, None, "cached answer")
+    assert cache.get_exact(key) == "cached answer"
+
+
+def test_exact_key_differs_per_namespace() -> None:
+    key_a = SemanticCache.exact_key("tenant_a", "system", "user question")
+    key_b = SemanticCache.exact_key("tenant_b", "system", "user question")
+    assert key_a != key_b
+
+
+def test_semantic_hit_above_threshold() -> None:
+    cache = SemanticCache(similarity_threshold=0.97)
+    key = SemanticCache.exact_key("tenant_a", "s", "u")
+    cache.put("tenant_a", key, _vec(1.0), "answer")
+    # identical direction → cosine 1.0
+    assert cache.get_semantic("tenant_a", _vec(2.0)) == "answer"
+
+
+def test_semantic_miss_below_threshold() -> None:
+    cache = SemanticCache(similarity_threshold=0.97)
+    key = SemanticCache.exact_key("tenant_a", "s", "u")
+    cache.put("tenant_a", key, _vec(1.0), "answer")
+    # orthogonal vector → cosine 0.0
+    assert cache.get_semantic("tenant_a", _vec(0.0, 1.0)) is None
+
+
+def test_semantic_lookup_is_tenant_scoped() -> None:
+    cache = SemanticCache()
+    key = SemanticCache.exact_key("tenant_a", "s", "u")
+    cache.put("tenant_a", key, _vec(1.0), "tenant a answer")
+    assert cache.get_semantic("tenant_b", _vec(1.0)) is None
+
+
+def test_expired_entries_are_evicted() -> None:
+    cache = SemanticCache(ttl_seconds=-1.0)  # everything already expired
+    key = SemanticCache.exact_key("tenant_a", "s", "u")
+    cache.put("tenant_a", key, _vec(1.0), "answer")
+    assert cache.get_exact(key) is None
+    assert cache.get_semantic("tenant_a", _vec(1.0)) is None
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import orjson
+import pytest
+
+from app.core import tenant_file_cache
+
+_ROW = {
+    "tenant_id": "test_tenant",
+    "name": "Test Tenant",
+    "schema_name": "tenant_test",
+    "s3_prefix": "tenants/test/",
+    "config": {"restricted_doc_types": ["ENG-MAT"]},
+}
+
+
+@pytest.fixture
+def cache_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    path = tmp_path / "ea-rag" / "tenant.json"
+    monkeypatch.setattr(tenant_file_cache, "_cache_path", path)
+    return path
+
+
+def test_miss_on_empty_cache(cache_path: Path) -> None:
+    assert tenant_file_cache.get("a" * 64) is None
+
+
+def test_put_get_roundtrip(cache_path: Path) -> None:
+    tenant_file_cache.put("a" * 64, _ROW)
+    assert tenant_file_cache.get("a" * 64) == _ROW
+    assert tenant_file_cache.get("b" * 64) is None
+
+
+def test_expired_entry_is_a_miss(cache_path: Path) -> None:
+    tenant_file_cache.put("a" * 64, _ROW)
+    entries = orjson.loads(cache_path.read_bytes())
+    entries["a" * 64]["expires_at"] = time.time() - 1
+    cache_path.write_bytes(orjson.dumps(entries))
+    assert tenant_file_cache.get("a" * 64) is None
+
+
+def test_corrupt_file_behaves_like_miss(cache_path: Path) -> None:
+    cache_path.parent.mkdir(parents=True)
+    cache_path.write_bytes(b"not json")
+    assert tenant_file_cache.get("a" * 64) is None
+    # and put() recovers by rewriting the file
+    tenant_file_cache.put("a" * 64, _ROW)
+    assert tenant_file_cache.get("a" * 64) == _ROW
+
+
+def test_clear_removes_file(cache_path: Path) -> None:
+    tenant_file_cache.put("a" * 64, _ROW)
+    tenant_file_cache.clear()
+    assert not cache_path.exists()
+    assert tenant_file_cache.get("a" * 64) is None
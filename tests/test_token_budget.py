@@ -59,7 +59,6 @@ def test_tier_label_enterprise():
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
 async def test_check_budget_no_row_allows_request():
     """Fail-open: missing usage row should not block the request."""
     session = _make_session(fetchone_result=None)
@@ -67,7 +66,6 @@ async def test_check_budget_no_row_allows_request():
     await check_token_budget(session, "test_tenant")
 
 
-@pytest.mark.asyncio
 async def test_check_budget_within_quota_passes():
     row = MagicMock()
     row.tokens_used = 100_000
@@ -77,7 +75,6 @@ async def test_check_budget_within_quota_passes():
     await check_token_budget(session, "test_tenant", estimated_tokens=500)
 
 
-@pytest.mark.asyncio
 async def test_check_budget_exceeded_raises_402():
     row = MagicMock()
     row.tokens_used = 1_999_700
@@ -89,7 +86,6 @@ async def test_check_budget_exceeded_raises_402():
     assert "quota" in exc_info.value.detail.lower()
 
 
-@pytest.mark.asyncio
 async def test_check_budget_exactly_at_quota_raises_402():
     row = MagicMock()
     row.tokens_used = 2_000_000
@@ -105,7 +101,6 @@ async def test_check_budget_exactly_at_quota_raises_402():
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
 async def test_record_token_usage_executes_upsert():
     session = _make_session()
     await record_token_usage(session, "test_tenant", input_tokens=800, output_tokens=434)
@@ -127,7 +122,6 @@ async def test_record_token_usage_executes_upsert():
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
 async def test_get_all_usage_returns_formatted_rows():
     from datetime import date
 
@@ -162,7 +156,6 @@ async def test_get_all_usage_returns_formatted_rows():
     assert r["estimated_cost_usd"] == expected_cost
 
 
-@pytest.mark.asyncio
 async def test_get_all_usage_empty():
     session = _make_session(fetchall_result=[])
     result = await get_all_usage(session)
@@ -174,7 +167,6 @@ async def test_get_all_usage_empty():
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
 async def test_chat_endpoint_returns_402_when_quota_exceeded():
     """Verify that the chat route propagates the 402 from check_token_budget."""
     import uuid